@@ -9,8 +9,8 @@ PayloadGenerator = sp.address("KT1EwMY7edPs6L1JNkEAyTU5qVSwZfVkYi5i")
 
 Admin = sp.address("tz1UikAq5Po4wefKL4WkzAHqmCDVnUC1AKAS")
 
+ApprovalTallyLimit = 100
 
-approve_type = sp.TSet(sp.TAddress)
 
 transfer_tez_type = sp.TRecord(
     to_ = sp.TAddress,
@@ -58,7 +58,7 @@ t_balance_of_response = sp.TRecord(
 ).layout(("request", "balance"))
 
 proposal_value_type = sp.TRecord(
-    approved = approve_type,
+    approval_count = sp.TNat,
     is_resolved = sp.TBool,
     proposer = sp.TAddress,
     create_time = sp.TTimestamp,
@@ -67,20 +67,160 @@ proposal_value_type = sp.TRecord(
 )
 
 event_value_type = sp.TRecord(
-    approved = approve_type,
+    approval_count = sp.TNat,
     passed = sp.TBool,
     proposer = sp.TAddress,
     create_time = sp.TTimestamp,
     generation = sp.TNat,
     token_id = sp.TNat,
     amount = sp.TOption(sp.TNat),
-    claims = sp.TMap(sp.TAddress, sp.TSignature)
+    claim_count = sp.TNat,
+    tallied_count = sp.TNat
+)
+
+token_templates_type = sp.TRecord(
+    stewardship = sp.TMap(sp.TString, sp.TBytes),
+    event = sp.TMap(sp.TString, sp.TBytes)
+)
+
+def fill_token_template(template, **fields):
+    # same token_info layout as TokenMetadataGenerator
+    token_info = template
+    for key, value in fields.items():
+        token_info = sp.update_map(token_info, key, sp.some(value))
+    return token_info
+
+def generation_label(generation):
+    # decimal digits of the generation, same as generation_label in tokenMetadataGenerator.py
+    label = sp.local("label", sp.bytes("0x"))
+    number = sp.local("number", generation)
+    sp.while (number.value > 0) | (sp.len(label.value) == 0):
+        label.value = sp.slice(sp.bytes("0x30313233343536373839"), number.value % 10, 1).open_some("open digit Error") + label.value
+        number.value = number.value // 10
+    return label.value
+
+def stewardship_token_info(template, label, multisig_name, multisig_description, creator):
+    return fill_token_template(
+        template,
+        name = sp.utils.bytes_of_string("[STEWARDSHIP TOKEN GEN-") + label + sp.utils.bytes_of_string("] ") + multisig_name,
+        description = multisig_description,
+        creators = sp.pack(creator)
+    )
+
+def event_token_info(template, label, multisig_name, event_name, event_description, creator):
+    return fill_token_template(
+        template,
+        name = sp.utils.bytes_of_string("[") + multisig_name + sp.utils.bytes_of_string(" GEN-") + label + sp.utils.bytes_of_string(" EVENT TOKEN] ") + event_name,
+        description = event_description,
+        creators = sp.pack(creator)
+    )
+
+multisig_storage_fields = dict(
+    info = sp.TRecord(
+        name = sp.TBytes,
+        description = sp.TBytes,
+        generation = sp.TNat,
+        generation_duration_minute = sp.TInt
+    ),
+    addresses = sp.TRecord(
+        factory = sp.TAddress,
+        token_metadata_generator = sp.TAddress,
+        payload_generator = sp.TAddress
+    ),
+    timestamp = sp.TRecord(
+        create_time = sp.TTimestamp,
+        generation_start_time = sp.TTimestamp,
+        generation_end_time = sp.TTimestamp
+    ),
+    event = sp.TRecord(
+        event_token_fa2 = sp.TAddress,
+        next_event_id = sp.TNat,
+        generation_first_event_id = sp.TNat,
+        events = sp.TBigMap(sp.TNat, event_value_type),
+        claims = sp.TBigMap(sp.TPair(sp.TNat, sp.TAddress), sp.TBytes),
+        claimants = sp.TBigMap(sp.TPair(sp.TNat, sp.TNat), sp.TAddress),
+        approvals = sp.TBigMap(sp.TPair(sp.TNat, sp.TAddress), sp.TUnit)
+    ),
+    proposal = sp.TRecord(
+        next_proposal_id = sp.TNat,
+        proposals = sp.TBigMap(sp.TNat, proposal_value_type),
+        approvals = sp.TBigMap(sp.TPair(sp.TNat, sp.TAddress), sp.TUnit)
+    ),
+    agreement_uri = sp.TBytes,
+    agreement_payload = sp.TBytes,
+    dataset_uri = sp.TBytes,
+    token_templates = token_templates_type,
+    gen0_stewardship_receipts = sp.TBigMap(sp.TAddress, sp.TBytes),
+    gen0_allowlist = sp.TRecord(
+        root = sp.TOption(sp.TBytes),
+        claimed = sp.TBigMap(sp.TAddress, sp.TUnit)
+    ),
+    stewardship_token = sp.TRecord(
+        fa2 = sp.TAddress,
+        id = sp.TNat,
+        holder_count = sp.TNat
+    ),
+    rollover = sp.TRecord(
+        in_progress = sp.TBool,
+        event_cursor = sp.TNat,
+        tally = sp.TBigMap(sp.TPair(sp.TNat, sp.TAddress), sp.TNat),
+        holders = sp.TBigMap(sp.TPair(sp.TNat, sp.TNat), sp.TAddress),
+        holder_count = sp.TNat,
+        mint_cursor = sp.TNat,
+        token_id = sp.TOption(sp.TNat)
+    ),
+    threshold = update_threshold_type,
+    metadata = sp.TBigMap(sp.TString, sp.TBytes)
+)
+
+multisig_storage_type = sp.TRecord(**multisig_storage_fields)
+
+# a proxy river keeps the multisig storage and only points to the shared logic
+multisig_proxy_storage_type = sp.TRecord(logic_store = sp.TAddress, **multisig_storage_fields)
+
+river_logic_type = sp.TLambda(
+    sp.TRecord(
+        params = sp.TBytes,
+        storage = multisig_proxy_storage_type
+    ),
+    multisig_proxy_storage_type,
+    with_operations = True
+)
+
+multisig_params_type = sp.TRecord(
+    name = sp.TBytes,
+    description = sp.TBytes,
+    agreement_uri = sp.TBytes,
+    dataset_uri = sp.TBytes,
+    contract_metadata = sp.TBytes,
+    allowlist_root = sp.TOption(sp.TBytes)
+)
+
+river_entrypoint_types = dict(
+    create_proposal = sp.TRecord(content = proposal_content_type, reserve = sp.TMap(sp.TBytes, sp.TBytes)),
+    sign_proposal = sp.TNat,
+    sign_proposals = sp.TList(sp.TNat),
+    sign_proposal_with_signatures = sp.TRecord(proposal_id = sp.TNat, signatures = sp.TList(sp.TPair(sp.TKey, sp.TSignature))),
+    resolve_proposal = sp.TNat,
+    create_event = sp.TRecord(name = sp.TBytes, description = sp.TBytes, edition = sp.TOption(sp.TNat)),
+    claim_event = sp.TRecord(public_key = sp.TKey, signature = sp.TSignature, event_id = sp.TNat),
+    claim_event_batch = sp.TRecord(event_id = sp.TNat, claims = sp.TList(sp.TPair(sp.TKey, sp.TSignature))),
+    approve_event = sp.TNat,
+    approve_events = sp.TList(sp.TNat),
+    claim_gen0_stewardship = sp.TRecord(public_key = sp.TKey, signature = sp.TSignature),
+    claim_gen0_stewardship_with_proof = sp.TList(sp.TBytes),
+    activate = sp.TUnit,
+    begin_reactivate = sp.TUnit,
+    process_reactivate = sp.TNat,
+    finalize_reactivate = sp.TNat,
+    refresh_token_templates = sp.TUnit
 )
 
 
 class MultiSigFactory(sp.Contract):
     def __init__(self, addresses):
         self.multi_sig = MultiSig()
+        self.multi_sig_proxy = MultiSigProxy()
         self.init(
             addresses = addresses,
             duration_minute = sp.record(
@@ -110,100 +250,222 @@ class MultiSigFactory(sp.Contract):
     def zero_tez(self):
         sp.verify(sp.amount == sp.tez(0), "TEZOS_NOT_ACCEPTED")
     
-    @sp.entry_point
-    def default(self):
-        sp.send(sp.sender, sp.amount)
+    def next_stewardship_token_id(self):
+        return sp.view(
+            "get_next_stewardship_token_id", 
+            self.data.addresses["stewardship_token_fa2"], 
+            sp.unit, 
+            sp.TNat
+        ).open_some("open get_next_stewardship_token_id view Error")
 
-    @sp.entry_point
-    def create_multisig(self, name, description, agreement_uri, dataset_uri, contract_metadata):
-        self.zero_tez()
-        sp.set_type(name, sp.TBytes)
-        sp.set_type(description, sp.TBytes)
-        sp.set_type(agreement_uri, sp.TBytes)
-        sp.set_type(dataset_uri, sp.TBytes)
-        sp.set_type(contract_metadata, sp.TBytes)
+    def token_templates(self):
+        return sp.view(
+            "get_token_templates", 
+            self.data.addresses["token_metadata_generator"], 
+            sp.unit, 
+            token_templates_type
+        ).open_some("open get_token_templates view Error")
 
-        # create multisig
-        contract_address = sp.create_contract(
-            storage = sp.record(
-                info = sp.record(
-                    name = name,
-                    description = description,
-                    generation = sp.nat(0),
-                    generation_duration_minute = self.data.duration_minute.genX
-                ),
-                addresses = sp.record(
-                    factory = sp.self_address,
-                    token_metadata_generator = self.data.addresses["token_metadata_generator"],
-                    payload_generator = self.data.addresses["payload_generator"]
+    def multisig_storage(self, params, stewardship_token_id, token_templates):
+        sp.set_type(params, multisig_params_type)
+
+        # generate agreement signing payload
+        agreement_payload = sp.view(
+            "gen_payload", 
+            self.data.addresses["payload_generator"], 
+            params.agreement_uri, 
+            sp.TBytes
+        ).open_some("open gen_payload view Error")
+
+        return dict(
+            info = sp.record(
+                name = params.name,
+                description = params.description,
+                generation = sp.nat(0),
+                generation_duration_minute = self.data.duration_minute.genX
+            ),
+            addresses = sp.record(
+                factory = sp.self_address,
+                token_metadata_generator = self.data.addresses["token_metadata_generator"],
+                payload_generator = self.data.addresses["payload_generator"]
+            ),
+            timestamp = sp.record(
+                create_time = sp.now,
+                generation_start_time = sp.now,
+                generation_end_time = sp.now.add_minutes(self.data.duration_minute.gen0)
+            ),
+            event = sp.record(
+                event_token_fa2 = self.data.addresses["event_token_fa2"],
+                next_event_id = sp.nat(0),
+                generation_first_event_id = sp.nat(0),
+                events = sp.big_map(
+                    tkey = sp.TNat,
+                    tvalue = event_value_type,
+                    l = {}
                 ),
-                timestamp = sp.record(
-                    create_time = sp.now,
-                    generation_start_time = sp.now,
-                    generation_end_time = sp.now.add_minutes(self.data.duration_minute.gen0)
+                claims = sp.big_map(
+                    tkey = sp.TPair(sp.TNat, sp.TAddress),
+                    tvalue = sp.TBytes,
+                    l = {}
                 ),
-                event = sp.record(
-                    event_token_fa2 = self.data.addresses["event_token_fa2"],
-                    next_event_id = sp.nat(0),
-                    event_id_list = sp.list([]),
-                    events = sp.big_map(
-                        tkey = sp.TNat,
-                        tvalue = event_value_type,
-                        l = {}
-                    )
+                claimants = sp.big_map(
+                    tkey = sp.TPair(sp.TNat, sp.TNat),
+                    tvalue = sp.TAddress,
+                    l = {}
                 ),
-                proposal = sp.record(
-                    next_proposal_id = sp.nat(0),
-                    proposals = sp.big_map(
-                        tkey = sp.TNat,
-                        tvalue = proposal_value_type,
-                        l = {}
-                    )
+                approvals = sp.big_map(
+                    tkey = sp.TPair(sp.TNat, sp.TAddress),
+                    tvalue = sp.TUnit,
+                    l = {}
+                )
+            ),
+            proposal = sp.record(
+                next_proposal_id = sp.nat(0),
+                proposals = sp.big_map(
+                    tkey = sp.TNat,
+                    tvalue = proposal_value_type,
+                    l = {}
                 ),
-                agreement_uri = agreement_uri,
-                dataset_uri = dataset_uri,
-                gen0_stewardship_signatures = sp.big_map(
+                approvals = sp.big_map(
+                    tkey = sp.TPair(sp.TNat, sp.TAddress),
+                    tvalue = sp.TUnit,
+                    l = {}
+                )
+            ),
+            agreement_uri = params.agreement_uri,
+            agreement_payload = agreement_payload,
+            dataset_uri = params.dataset_uri,
+            token_templates = token_templates,
+            gen0_stewardship_receipts = sp.big_map(
+                tkey = sp.TAddress,
+                tvalue = sp.TBytes,
+                l = {}
+            ),
+            gen0_allowlist = sp.record(
+                root = params.allowlist_root,
+                claimed = sp.big_map(
                     tkey = sp.TAddress,
-                    tvalue = sp.TSignature,
+                    tvalue = sp.TUnit,
+                    l = {}
+                )
+            ),
+            stewardship_token = sp.record(
+                fa2 = self.data.addresses["stewardship_token_fa2"],
+                id = stewardship_token_id,
+                holder_count = sp.nat(0)
+            ),
+            rollover = sp.record(
+                in_progress = False,
+                event_cursor = sp.nat(0),
+                tally = sp.big_map(
+                    tkey = sp.TPair(sp.TNat, sp.TAddress),
+                    tvalue = sp.TNat,
                     l = {}
                 ),
-                stewardship_token = sp.record(
-                    fa2 = self.data.addresses["stewardship_token_fa2"],
-                    id = sp.nat(0)
+                holders = sp.big_map(
+                    tkey = sp.TPair(sp.TNat, sp.TNat),
+                    tvalue = sp.TAddress,
+                    l = {}
                 ),
-                threshold = self.data.default_threshold,
-                metadata = sp.big_map(l = {"": contract_metadata})
+                holder_count = sp.nat(0),
+                mint_cursor = sp.nat(0),
+                token_id = sp.none
             ),
-            contract = self.multi_sig, 
-            amount = sp.tez(0),
-            baker = self.data.baker
+            threshold = self.data.default_threshold,
+            metadata = sp.big_map(l = {"": params.contract_metadata})
         )
-        
-        # create stewardship token
-        c_self_create = sp.self_entrypoint("_create_gen0_token")
-        sp.transfer(contract_address, sp.mutez(0), c_self_create)
-        
-        # record multisig info
+
+    def gen0_stewardship_token(self, contract_address, name, description, token_templates):
+        # generate gen0 stewardship metadata
+        return sp.record(
+            is_stewardship = True,
+            minter = contract_address,
+            token_info = stewardship_token_info(
+                token_templates.stewardship,
+                sp.utils.bytes_of_string("1"),
+                name,
+                description,
+                contract_address
+            )
+        )
+
+    def create_tokens(self, tokens):
+        c_create_fa2 = sp.contract(
+            sp.TList(
+                sp.TRecord(
+                    is_stewardship = sp.TBool,
+                    minter = sp.TAddress,
+                    token_info = sp.TMap(sp.TString, sp.TBytes)
+                )
+            ), 
+            self.data.addresses["stewardship_token_fa2"], 
+            entry_point = "create_token").open_some()
+        sp.transfer(
+            tokens, 
+            sp.mutez(0), 
+            c_create_fa2
+        )
+
+    def record_multisig(self, contract_address, name):
         self.data.multisigs[contract_address] = sp.record(
             creator = sp.sender,
             name = name,
             create_time = sp.now
         )
-
+    
     @sp.entry_point
-    def _create_gen0_token(self, multisig_address):
-        sp.verify(sp.sender == sp.self_address, "ONLY_SELF_CALL")
-        c_create = sp.contract(
-            sp.TUnit, 
-            multisig_address, 
-            entry_point = "create_gen0_stewardship").open_some()
-        
-        sp.transfer(
-            sp.unit, 
-            sp.mutez(0), 
-            c_create
+    def default(self):
+        sp.send(sp.sender, sp.amount)
+
+    def originate_multisig(self, params, stewardship_token_id, token_templates, contract):
+        # create a river of contract and record it, returns its gen0 st token
+        storage = self.multisig_storage(params, stewardship_token_id, token_templates)
+        if contract is self.multi_sig_proxy:
+            # a proxy river runs the shared logic of river_logic_store
+            storage = dict(logic_store = self.data.addresses["river_logic_store"], **storage)
+        contract_address = sp.create_contract(
+            storage = sp.record(**storage),
+            contract = contract, 
+            amount = sp.tez(0),
+            baker = self.data.baker
         )
-    
+
+        # record multisig info
+        self.record_multisig(contract_address, params.name)
+        return self.gen0_stewardship_token(contract_address, params.name, params.description, token_templates)
+
+    @sp.entry_point
+    def create_multisig(self, params):
+        self.zero_tez()
+        token_templates = sp.compute(self.token_templates())
+
+        # create multisig, its gen0 st token is created right after it
+        self.create_tokens(sp.list([self.originate_multisig(params, self.next_stewardship_token_id(), token_templates, self.multi_sig)]))
+
+    @sp.entry_point
+    def create_multisigs(self, multisigs):
+        self.zero_tez()
+        sp.set_type(multisigs, sp.TList(multisig_params_type))
+
+        # the gen0 st tokens are created in the same order as the multisigs
+        token_templates = sp.compute(self.token_templates())
+        stewardship_token_id = sp.local("stewardship_token_id", self.next_stewardship_token_id())
+        tokens = sp.local("tokens", sp.list([]))
+        sp.for params in multisigs:
+            tokens.value.push(self.originate_multisig(params, stewardship_token_id.value, token_templates, self.multi_sig))
+            stewardship_token_id.value += 1
+
+        # create all stewardship tokens in one batch
+        self.create_tokens(tokens.value.rev())
+
+    @sp.entry_point
+    def create_multisig_proxy(self, params):
+        self.zero_tez()
+        token_templates = sp.compute(self.token_templates())
+
+        # create proxy multisig, its gen0 st token is created right after it
+        self.create_tokens(sp.list([self.originate_multisig(params, self.next_stewardship_token_id(), token_templates, self.multi_sig_proxy)]))
+
     @sp.entry_point
     def _update_address(self, name, address):
         self.is_admin()
@@ -245,68 +507,21 @@ class MultiSigFactory(sp.Contract):
 
 
 
-class MultiSig(sp.Contract):
-    def __init__(self):
-        self.init(
-            info = sp.record(
-                name = sp.utils.bytes_of_string("River"),
-                description = sp.utils.bytes_of_string("This is a river."),
-                generation = sp.nat(0),
-                generation_duration_minute = sp.int(129600)
-            ),
-            addresses = sp.record(
-                factory = TokenFA2,
-                token_metadata_generator = TokenMetadataGenerator,
-                payload_generator = PayloadGenerator
-            ),
-            timestamp = sp.record(
-                create_time = sp.timestamp(0),
-                generation_start_time = sp.timestamp(0),
-                generation_end_time = sp.timestamp(0)
-            ),
-            event = sp.record(
-                event_token_fa2 = TokenFA2,
-                next_event_id = sp.nat(0),
-                event_id_list = sp.list([]),
-                events = sp.big_map(
-                    tkey = sp.TNat,
-                    tvalue = event_value_type
-                )
-            ),
-            proposal = sp.record(
-                next_proposal_id = sp.nat(0),
-                proposals = sp.big_map(
-                    tkey = sp.TNat,
-                    tvalue = proposal_value_type
-                )
-            ),
-            agreement_uri = sp.utils.bytes_of_string(MetadataUrl),
-            dataset_uri = sp.utils.bytes_of_string(MetadataUrl),
-            gen0_stewardship_signatures = sp.big_map(
-                tkey = sp.TAddress,
-                tvalue = sp.TSignature
-            ),
-            stewardship_token = sp.record(
-                fa2 = TokenFA2,
-                id = sp.nat(0)
-            ),
-            threshold = sp.record(
-                ratio_number = 1,
-                ratio_total = 3,
-                minimum_count = 20
-            ),
-            metadata = sp.big_map({"":sp.utils.bytes_of_string(MetadataUrl)})
-        )
-    
-    @sp.entry_point
-    def default(self):
-        pass
+class MultiSigLogic:
+    """River logic shared by the MultiSig entrypoints and the RiverLogicStore lambdas.
+
+    Only works on `self.data`, so it runs the same against the contract storage
+    or against the storage a proxy river passes to its logic lambda.
+    """
 
     def zero_tez(self):
         sp.verify(sp.amount == sp.tez(0), "TEZOS_NOT_ACCEPTED")
-    
+
     def check_member(self, address):
-        balanceResult = sp.view("get_balance_of", self.data.stewardship_token.fa2, sp.list([sp.record(owner=address, token_id=self.data.stewardship_token.id)]), sp.TList(t_balance_of_response)).open_some("open get_balance_of view Error")
+        self.check_members(sp.list([sp.record(owner=address, token_id=self.data.stewardship_token.id)]))
+
+    def check_members(self, requests):
+        balanceResult = sp.view("get_balance_of", self.data.stewardship_token.fa2, requests, sp.TList(t_balance_of_response)).open_some("open get_balance_of view Error")
         sp.for balanceData in balanceResult:
             sp.verify(balanceData.balance > 0, "NO_OWNING_STEWARDSHIP_TOKEN")
 
@@ -315,9 +530,27 @@ class MultiSig(sp.Contract):
         sp.verify(self.data.info.generation > 0, "NOT_ACTIVATED_YET")
 
     def check_threshold(self, approveCount):
-        st_holders = sp.view("get_token_holders", self.data.stewardship_token.fa2, self.data.stewardship_token.id, sp.TSet(sp.TAddress)).open_some("open get_token_holders view Error")
-        return (approveCount >= self.data.threshold.minimum_count) & (approveCount * self.data.threshold.ratio_total >= sp.len(st_holders) * self.data.threshold.ratio_number)
-
+        # holder_count is snapshotted when the generation starts
+        return (approveCount >= self.data.threshold.minimum_count) & (approveCount * self.data.threshold.ratio_total >= self.data.stewardship_token.holder_count * self.data.threshold.ratio_number)
+
+    def tally_holder(self, holder):
+        tally_key = sp.compute((self.data.info.generation, holder))
+        sp.if ~self.data.rollover.tally.contains(tally_key):
+            self.data.rollover.tally[tally_key] = 0
+            self.data.rollover.holders[(self.data.info.generation, self.data.rollover.holder_count)] = holder
+            self.data.rollover.holder_count += 1
+        self.data.rollover.tally[tally_key] += 1
+
+    def tally_event_claims(self, event_id, limit):
+        # tally up to limit claimants of a passed event that are not tallied yet, returns the tallied count
+        event_data = sp.compute(self.data.event.events[event_id])
+        tally_end = sp.compute(sp.min(event_data.claim_count, event_data.tallied_count + limit))
+        tally_cursor = sp.local("tally_cursor", event_data.tallied_count)
+        sp.while tally_cursor.value < tally_end:
+            self.tally_holder(self.data.event.claimants[(event_id, tally_cursor.value)])
+            tally_cursor.value += 1
+        self.data.event.events[event_id].tallied_count = tally_end
+        return sp.as_nat(tally_end - event_data.tallied_count)
 
     def validate_proposal(self, content):
         with content.match_cases() as arg:
@@ -328,9 +561,7 @@ class MultiSig(sp.Contract):
             with arg.match("update_dataset_uri") as proposal_data:
                 pass
             with arg.match("update_threshold") as proposal_data:
-                st_holders = sp.view("get_token_holders", self.data.stewardship_token.fa2, self.data.stewardship_token.id, sp.TSet(sp.TAddress)).open_some("open get_token_holders view Error")
-                holderCount = sp.compute(sp.len(st_holders))
-                sp.verify(proposal_data.minimum_count <= holderCount, "MINIMUM_COUNT_ERROR: over holders count")
+                sp.verify(proposal_data.minimum_count <= self.data.stewardship_token.holder_count, "MINIMUM_COUNT_ERROR: over holders count")
                 sp.verify(proposal_data.ratio_number <= proposal_data.ratio_total, "RATIO_ERROR: numerator should not greater than denominator")
             with arg.match("update_generation_duration_minute") as proposal_data:
                 pass
@@ -339,15 +570,15 @@ class MultiSig(sp.Contract):
             with arg.match("lambda_ops") as proposal_data:
                 pass
 
-    
     def execute_transfer_tez(self, content, proposal_id):
         sp.send(content.to_, content.amount)
         self.data.proposal.proposals[proposal_id].is_resolved = True
-        
+
     def execute_update_agreement_uri(self, content, proposal_id):
         self.data.agreement_uri = content
+        self.data.agreement_payload = sp.view("gen_payload", self.data.addresses.payload_generator, content, sp.TBytes).open_some("open gen_payload view Error")
         self.data.proposal.proposals[proposal_id].is_resolved = True
-        
+
     def execute_update_dataset_uri(self, content, proposal_id):
         self.data.dataset_uri = content
         self.data.proposal.proposals[proposal_id].is_resolved = True
@@ -370,7 +601,6 @@ class MultiSig(sp.Contract):
         sp.add_operations(operations)
         self.data.proposal.proposals[proposal_id].is_resolved = True
 
-
     def execute_proposal(self, proposal_id):
         with self.data.proposal.proposals[proposal_id].content.match_cases() as arg:
             with arg.match("transfer_tez") as proposal_data:
@@ -388,8 +618,7 @@ class MultiSig(sp.Contract):
             with arg.match("lambda_ops") as proposal_data:
                 self.execute_lambda_ops(proposal_data, proposal_id)
 
-    @sp.entry_point
-    def create_proposal(self, content, reserve):
+    def create_proposal_(self, content, reserve):
         self.zero_tez()
         self.check_member(sp.sender)
         self.check_valid_time()
@@ -397,7 +626,7 @@ class MultiSig(sp.Contract):
         sp.set_type(reserve, sp.TMap(sp.TBytes, sp.TBytes))
         self.validate_proposal(content)
         self.data.proposal.proposals[self.data.proposal.next_proposal_id] = sp.record(
-            approved = sp.set([]),
+            approval_count = sp.nat(0),
             is_resolved = sp.bool(False),
             proposer = sp.sender,
             create_time = sp.now,
@@ -405,23 +634,59 @@ class MultiSig(sp.Contract):
             content = content
         )
         self.data.proposal.next_proposal_id += 1
-        
-    @sp.entry_point
-    def sign_proposal(self, proposal_id):
-        self.zero_tez()
-        self.check_member(sp.sender)
-        self.check_valid_time()
+
+    def add_proposal_approval(self, proposal_id, signer):
         sp.verify(self.data.proposal.proposals.contains(proposal_id), "PROPOSAL_ID_NOT_EXISTED")
         
         proposal = sp.compute(self.data.proposal.proposals[proposal_id])
         sp.verify(~proposal.is_resolved, "PROPOSAL_IS_RESOLVED")
         sp.verify(self.data.info.generation == proposal.generation, "NOT_CURRENT_GENERATION_PROPOSAL")
-        sp.verify(~proposal.approved.contains(sp.sender), "PROPOSAL_APPROVED_ALREADY")
+        sp.verify(~self.data.proposal.approvals.contains((proposal_id, signer)), "PROPOSAL_APPROVED_ALREADY")
         
-        self.data.proposal.proposals[proposal_id].approved.add(sp.sender)
+        self.data.proposal.approvals[(proposal_id, signer)] = sp.unit
+        self.data.proposal.proposals[proposal_id].approval_count += 1
 
-    @sp.entry_point
-    def resolve_proposal(self, proposal_id):
+    def sign_proposal_(self, proposal_id):
+        self.zero_tez()
+        self.check_member(sp.sender)
+        self.check_valid_time()
+        self.add_proposal_approval(proposal_id, sp.sender)
+
+    def sign_proposals_(self, proposal_ids):
+        sp.set_type(proposal_ids, sp.TList(sp.TNat))
+        self.zero_tez()
+        self.check_member(sp.sender)
+        self.check_valid_time()
+        sp.for proposal_id in proposal_ids:
+            self.add_proposal_approval(proposal_id, sp.sender)
+
+    def sign_proposal_with_signatures_(self, proposal_id, signatures):
+        sp.set_type(proposal_id, sp.TNat)
+        sp.set_type(signatures, sp.TList(sp.TPair(sp.TKey, sp.TSignature)))
+        self.zero_tez()
+        self.check_valid_time()
+        # signing payload of (river address, "sign_proposal", proposal_id, generation), tagged apart
+        # from the relayed claim_event payload
+        payload = sp.compute(sp.view(
+            "gen_payload", 
+            self.data.addresses.payload_generator, 
+            sp.pack((sp.self_address, sp.string("sign_proposal"), proposal_id, self.data.info.generation)), 
+            sp.TBytes
+        ).open_some("open gen_payload view Error"))
+
+        requests = sp.local("requests", sp.list([]))
+        sp.for signed in signatures:
+            public_key = sp.compute(sp.fst(signed))
+            # check signature
+            sp.verify(sp.check_signature(public_key, sp.snd(signed), payload), "SIGNATURE_NOT_MATCHED")
+            signer = sp.compute(sp.to_address(sp.implicit_account(sp.hash_key(public_key))))
+            requests.value.push(sp.record(owner = signer, token_id = self.data.stewardship_token.id))
+            self.add_proposal_approval(proposal_id, signer)
+
+        # check every signer's membership in one view call
+        self.check_members(requests.value)
+
+    def resolve_proposal_(self, proposal_id):
         self.zero_tez()
         # Check basic limitation
         self.check_valid_time()
@@ -430,12 +695,22 @@ class MultiSig(sp.Contract):
         sp.verify(~proposal.is_resolved, "PROPOSAL_IS_RESOLVED")
         sp.verify(self.data.info.generation == proposal.generation, "NOT_CURRENT_GENERATION_PROPOSAL")
         # Check threshold
-        sp.verify(self.check_threshold(sp.len(proposal.approved)), "NOT_REACH_THRESHOLD")
+        sp.verify(self.check_threshold(proposal.approval_count), "NOT_REACH_THRESHOLD")
         # execute
         self.execute_proposal(proposal_id)
 
-    @sp.entry_point
-    def create_event(self, name, description, edition):
+    def refresh_token_templates_(self):
+        self.zero_tez()
+        # the river builds token_info from its own copy of the templates, anyone can bring the
+        # copy in line with the token metadata generator after its admin updates a template
+        self.data.token_templates = sp.view(
+            "get_token_templates", 
+            self.data.addresses.token_metadata_generator, 
+            sp.unit, 
+            token_templates_type
+        ).open_some("open get_token_templates view Error")
+
+    def create_event_(self, name, description, edition):
         self.zero_tez()
         # check member & valid time
         self.check_member(sp.sender)
@@ -452,18 +727,14 @@ class MultiSig(sp.Contract):
         ).open_some("open get_next_event_token_id view Error"))
 
         # generate event metadata
-        event_token_metadata = sp.view(
-            "gen_event_token", 
-            self.data.addresses.token_metadata_generator, 
-            sp.record(
-                creator = sp.self_address,
-                event_description = description,
-                generation = self.data.info.generation,
-                multisig_name = self.data.info.name,
-                event_name = name
-            ), 
-            sp.TMap(sp.TString, sp.TBytes)
-        ).open_some("open gen_event_token view Error")
+        event_token_metadata = sp.compute(event_token_info(
+            self.data.token_templates.event,
+            generation_label(self.data.info.generation),
+            self.data.info.name,
+            name,
+            description,
+            sp.self_address
+        ))
 
         # create event token
         c_fa2 = sp.contract(
@@ -490,30 +761,26 @@ class MultiSig(sp.Contract):
         
         # record info in storage
         self.data.event.events[self.data.event.next_event_id] = sp.record(
-            approved = sp.set([]),
+            approval_count = sp.nat(0),
             passed = False,
             proposer = sp.sender,
             create_time = sp.now,
             generation = self.data.info.generation,
             token_id = event_token_id,
             amount = edition,
-            claims = sp.map(l={})
+            claim_count = sp.nat(0),
+            tallied_count = sp.nat(0)
         )
-        self.data.event.event_id_list.push(self.data.event.next_event_id)
         self.data.event.next_event_id += 1
 
-    @sp.entry_point
-    def claim_event(self, public_key, signature, event_id):
-        self.zero_tez()
-        self.check_valid_time()
-        # check public key matching with sender's key hash
-        sp.verify(sp.sender == sp.to_address(sp.implicit_account(sp.hash_key(public_key))), "PUBLIC_KEY_ERROR: not matched with sender")
-        # check signature 
-        payload = sp.view("gen_payload", self.data.addresses.payload_generator, self.data.agreement_uri, sp.TBytes).open_some("open gen_payload view Error")
-        sp.verify(sp.check_signature(public_key, signature, payload), "SIGNATURE_NOT_MATCHED")
+    def claim_receipt(self, signature):
+        # a 32 bytes digest marks the claim, the signature itself is never read again
+        return sp.blake2b(sp.pack(signature))
+
+    def add_event_claim(self, event_id, claimant, signature):
         event_data = sp.compute(self.data.event.events[event_id])
         # check re-claim
-        sp.verify(~event_data.claims.contains(sp.sender), "CANNOT_CLAIM_TWICE")
+        sp.verify(~self.data.event.claims.contains((event_id, claimant)), "CANNOT_CLAIM_TWICE")
         # check generation
         sp.verify(self.data.info.generation == event_data.generation, "NOT_CURRENT_GENERATION_EVENT")
         # check amount
@@ -522,7 +789,16 @@ class MultiSig(sp.Contract):
             # minus the edtion if edtion is limited
             self.data.event.events[event_id].amount = sp.some(sp.as_nat(event_edition - 1, "EVENT_EDITION_INSUFFICIENT"))
         
-        # mint event token
+        # record the signature receipt into storage
+        self.data.event.claims[(event_id, claimant)] = self.claim_receipt(signature)
+        self.data.event.claimants[(event_id, event_data.claim_count)] = claimant
+        self.data.event.events[event_id].claim_count += 1
+
+        # count the claim toward the next stewardship if the event has passed
+        sp.if event_data.passed:
+            self.tally_event_claims(event_id, 1)
+
+    def mint_event_tokens(self, mints):
         c_fa2 = sp.contract(
             sp.TList(
                 sp.TRecord(
@@ -534,101 +810,104 @@ class MultiSig(sp.Contract):
             self.data.event.event_token_fa2, 
             entry_point = "mint").open_some()
         sp.transfer(
+            mints, 
+            sp.mutez(0), 
+            c_fa2
+        )
+
+    def claim_event_(self, public_key, signature, event_id):
+        self.zero_tez()
+        self.check_valid_time()
+        # check public key matching with sender's key hash
+        sp.verify(sp.sender == sp.to_address(sp.implicit_account(sp.hash_key(public_key))), "PUBLIC_KEY_ERROR: not matched with sender")
+        # check signature 
+        sp.verify(sp.check_signature(public_key, signature, self.data.agreement_payload), "SIGNATURE_NOT_MATCHED")
+        self.add_event_claim(event_id, sp.sender, signature)
+        
+        # mint event token
+        self.mint_event_tokens(
             sp.list([
                 sp.record(
                     address = sp.sender,
                     amount = sp.nat(1),
-                    token_id = event_data.token_id
+                    token_id = self.data.event.events[event_id].token_id
                 )
-            ]), 
-            sp.mutez(0), 
-            c_fa2
+            ])
         )
-        
-        # record signature into storage
-        self.data.event.events[event_id].claims[sp.sender] = signature
 
-    @sp.entry_point
-    def approve_event(self, event_id):
+    def claim_event_batch_(self, event_id, claims):
+        sp.set_type(event_id, sp.TNat)
+        sp.set_type(claims, sp.TList(sp.TPair(sp.TKey, sp.TSignature)))
         self.zero_tez()
-        self.check_member(sp.sender)
         self.check_valid_time()
         sp.verify(self.data.event.events.contains(event_id), "EVENT_ID_NOT_EXISTED")
+
+        # signing payload of (river address, "claim_event", agreement uri, event_id, generation), an
+        # agreement signature is public once used and must not claim events for its signer, the
+        # agreement uri makes a relayed claim also sign the river's current agreement
+        payload = sp.compute(sp.view(
+            "gen_payload", 
+            self.data.addresses.payload_generator, 
+            sp.pack((sp.self_address, sp.string("claim_event"), self.data.agreement_uri, event_id, self.data.info.generation)), 
+            sp.TBytes
+        ).open_some("open gen_payload view Error"))
+
+        token_id = sp.compute(self.data.event.events[event_id].token_id)
+        mints = sp.local("mints", sp.list([]))
+        sp.for claim in claims:
+            public_key = sp.compute(sp.fst(claim))
+            # check signature
+            sp.verify(sp.check_signature(public_key, sp.snd(claim), payload), "SIGNATURE_NOT_MATCHED")
+            claimant = sp.compute(sp.to_address(sp.implicit_account(sp.hash_key(public_key))))
+            self.add_event_claim(event_id, claimant, sp.snd(claim))
+            mints.value.push(
+                sp.record(
+                    address = claimant,
+                    amount = sp.nat(1),
+                    token_id = token_id
+                )
+            )
+        
+        # mint event tokens for every claimant in one call
+        self.mint_event_tokens(mints.value)
+
+    def add_event_approval(self, event_id, approver):
+        sp.verify(self.data.event.events.contains(event_id), "EVENT_ID_NOT_EXISTED")
         
         event = sp.compute(self.data.event.events[event_id])
         sp.verify(self.data.info.generation == event.generation, "NOT_CURRENT_GENERATION_PROPOSAL")
-        sp.verify(~event.approved.contains(sp.sender), "EVENT_APPROVED_ALREADY")
+        sp.verify(~self.data.event.approvals.contains((event_id, approver)), "EVENT_APPROVED_ALREADY")
         
-        self.data.event.events[event_id].approved.add(sp.sender)
+        self.data.event.approvals[(event_id, approver)] = sp.unit
+        self.data.event.events[event_id].approval_count += 1
 
-    @sp.entry_point
-    def create_gen0_stewardship(self):
+        # tally the claims so far once the event reaches the threshold
+        sp.if ~event.passed & self.check_threshold(event.approval_count + 1):
+            self.data.event.events[event_id].passed = True
+            self.tally_event_claims(event_id, ApprovalTallyLimit)
+
+    def approve_event_(self, event_id):
         self.zero_tez()
-        # check sender
-        sp.verify(sp.sender == self.data.addresses.factory, "ONLY_FACTORY_CAN_CREATE")
-        # check generation
-        sp.verify(self.data.info.generation == 0, "GENERATION_INCORRECT")
-        # check stewardship token id
-        sp.verify(self.data.stewardship_token.id == 0, "CREATE_ALREADY")
-        
-        # generate st token ID
-        self.data.stewardship_token.id = sp.compute(sp.view(
-            "get_next_stewardship_token_id", 
-            self.data.stewardship_token.fa2, 
-            sp.unit, 
-            sp.TNat
-        ).open_some("open get_next_stewardship_token_id view Error"))
+        self.check_member(sp.sender)
+        self.check_valid_time()
+        self.add_event_approval(event_id, sp.sender)
 
-        # generate stewardship metadata
-        stewardship_token_metadata = sp.view(
-            "gen_stewardship_token", 
-            self.data.addresses.token_metadata_generator, 
-            sp.record(
-                generation = sp.nat(1),
-                multisig_name = self.data.info.name,
-                multisig_description = self.data.info.description,
-                creator = sp.self_address
-            ), 
-            sp.TMap(sp.TString, sp.TBytes)
-        ).open_some("open gen_stewardship_token view Error")
-        
-        # create stewardship token
-        c_create_fa2 = sp.contract(
-            sp.TList(
-                sp.TRecord(
-                    is_stewardship = sp.TBool,
-                    minter = sp.TAddress,
-                    token_info = sp.TMap(sp.TString, sp.TBytes)
-                )
-            ), 
-            self.data.stewardship_token.fa2, 
-            entry_point = "create_token").open_some()
-        sp.transfer(
-            sp.list([
-                sp.record(
-                    is_stewardship = True,
-                    minter = sp.self_address,
-                    token_info = stewardship_token_metadata
-                )
-            ]), 
-            sp.mutez(0), 
-            c_create_fa2
-        )
-    
-    @sp.entry_point
-    def claim_gen0_stewardship(self, public_key, signature):
+    def approve_events_(self, event_ids):
+        sp.set_type(event_ids, sp.TList(sp.TNat))
         self.zero_tez()
+        self.check_member(sp.sender)
+        self.check_valid_time()
+        sp.for event_id in event_ids:
+            self.add_event_approval(event_id, sp.sender)
+
+    def mint_gen0_stewardship(self, claimant):
         # check generation
         sp.verify(self.data.info.generation == 0, "GENERATION_ERROR")
         # check time
         sp.verify(sp.now <= self.data.timestamp.generation_end_time, "CLAIM_EXPIRED")
-        # check public key matching with sender's key hash
-        sp.verify(sp.sender == sp.to_address(sp.implicit_account(sp.hash_key(public_key))), "PUBLIC_KEY_ERROR: not matched with sender")
-        # check signature 
-        payload = sp.view("gen_payload", self.data.addresses.payload_generator, self.data.agreement_uri, sp.TBytes).open_some("open gen_payload view Error")
-        sp.verify(sp.check_signature(public_key, signature, payload), "SIGNATURE_NOT_MATCHED")
         # check re-claim
-        sp.verify(~self.data.gen0_stewardship_signatures.contains(sp.sender), "CANNOT_CLAIM_TWICE")
+        sp.verify(~self.data.gen0_stewardship_receipts.contains(claimant), "CANNOT_CLAIM_TWICE")
+        sp.verify(~self.data.gen0_allowlist.claimed.contains(claimant), "CANNOT_CLAIM_TWICE")
         
         # mint stewardship token
         c_fa2 = sp.contract(
@@ -644,7 +923,7 @@ class MultiSig(sp.Contract):
         sp.transfer(
             sp.list([
                 sp.record(
-                    address = sp.sender,
+                    address = claimant,
                     amount = sp.nat(1),
                     token_id = self.data.stewardship_token.id
                 )
@@ -652,127 +931,183 @@ class MultiSig(sp.Contract):
             sp.mutez(0), 
             c_fa2
         )
+
+    def claim_gen0_stewardship_(self, public_key, signature):
+        self.zero_tez()
+        # check public key matching with sender's key hash
+        sp.verify(sp.sender == sp.to_address(sp.implicit_account(sp.hash_key(public_key))), "PUBLIC_KEY_ERROR: not matched with sender")
+        # check signature 
+        sp.verify(sp.check_signature(public_key, signature, self.data.agreement_payload), "SIGNATURE_NOT_MATCHED")
+        self.mint_gen0_stewardship(sp.sender)
         
-        # record signature into storage
-        self.data.gen0_stewardship_signatures[sp.sender] = signature
+        # record the signature receipt into storage
+        self.data.gen0_stewardship_receipts[sp.sender] = self.claim_receipt(signature)
 
-    @sp.entry_point()
-    def activate(self):
+    def claim_gen0_stewardship_with_proof_(self, proof):
+        sp.set_type(proof, sp.TList(sp.TBytes))
+        self.zero_tez()
+        root = sp.compute(self.data.gen0_allowlist.root.open_some("ALLOWLIST_NOT_SET"))
+
+        # hash the sender up to the root, each node hashes its two children in sorted order
+        node = sp.local("node", sp.blake2b(sp.pack(sp.sender)))
+        sp.for sibling in proof:
+            sp.if node.value < sibling:
+                node.value = sp.blake2b(node.value + sibling)
+            sp.else:
+                node.value = sp.blake2b(sibling + node.value)
+        sp.verify(node.value == root, "NOT_IN_ALLOWLIST")
+        self.mint_gen0_stewardship(sp.sender)
+
+        # the creator checked the signature off-chain, only the membership is recorded
+        self.data.gen0_allowlist.claimed[sp.sender] = sp.unit
+
+    def activate_(self):
         self.zero_tez()
         # check generation
         sp.verify(self.data.info.generation == 0, "GENEATION_ERROR")
         # check time
         sp.verify(sp.now > self.data.timestamp.generation_end_time, "STILL_IN_CLAIMING_TIME")
         # check limitation
-        st_holders = sp.view("get_token_holders", self.data.stewardship_token.fa2, self.data.stewardship_token.id, sp.TSet(sp.TAddress)).open_some("open get_token_holders view Error")
-        holderCount = sp.compute(sp.len(st_holders))
+        holderCount = sp.compute(sp.view("get_holder_count", self.data.stewardship_token.fa2, self.data.stewardship_token.id, sp.TNat).open_some("open get_holder_count view Error"))
         sp.verify(holderCount >= self.data.threshold.minimum_count, "APPROVE_COUNT_INSUFFICIENT")
 
         # set to new generation
         self.data.timestamp.generation_start_time = sp.now
         self.data.timestamp.generation_end_time = sp.now.add_minutes(self.data.info.generation_duration_minute)
         self.data.info.generation = 1
-    
-    @sp.entry_point()
-    def reactivate(self):
+        self.data.stewardship_token.holder_count = holderCount
+
+    def begin_reactivate_(self):
         self.zero_tez()
         # check generation
         sp.verify(self.data.info.generation > 0, "GENEATION_ERROR")
         # check time
         sp.verify(sp.now > self.data.timestamp.generation_end_time, "STILL_IN_GENERATION_TIME")
+        sp.verify(~self.data.rollover.in_progress, "REACTIVATE_IN_PROGRESS")
 
-        # calculate apporval in all events 
-        newStHolders = sp.local("newStHolders", sp.map(l={}, tkey=sp.TAddress, tvalue=sp.TNat))
-        sp.for event_id in self.data.event.event_id_list:
+        # process events from the first one of the generation
+        self.data.rollover.in_progress = True
+        self.data.rollover.event_cursor = self.data.event.generation_first_event_id
+        self.data.rollover.mint_cursor = 0
+        self.data.rollover.token_id = sp.none
+
+    def process_reactivate_(self, batch_size):
+        self.zero_tez()
+        sp.set_type(batch_size, sp.TNat)
+        sp.verify(self.data.rollover.in_progress, "REACTIVATE_NOT_BEGUN")
+
+        # settle the remaining events within batch_size steps, one per tallied claim or per event without claims to tally
+        budget = sp.local("budget", batch_size)
+        sp.while (budget.value > 0) & (self.data.rollover.event_cursor < self.data.event.next_event_id):
+            event_id = sp.compute(self.data.rollover.event_cursor)
             event_data = sp.compute(self.data.event.events[event_id])
-            sp.if self.check_threshold(sp.len(event_data.approved)):
+            sp.if ~event_data.passed & self.check_threshold(event_data.approval_count):
                 self.data.event.events[event_id].passed = True
-                event_holders = sp.view("get_token_holders", self.data.event.event_token_fa2, event_data.token_id, sp.TSet(sp.TAddress)).open_some("open get_token_holders view Error")
-                sp.for holder in event_holders.elements():
-                    sp.if ~newStHolders.value.contains(holder):
-                        newStHolders.value[holder] = 0
-                    newStHolders.value[holder] += 1
-        
-        # check limitation
-        sp.verify(sp.len(newStHolders.value) >= self.data.threshold.minimum_count, "NEW_ST_HOLDER_COUNT_INSUFFICIENT")
+            tallied = sp.local("tallied", sp.nat(0))
+            sp.if self.data.event.events[event_id].passed:
+                tallied.value = self.tally_event_claims(event_id, budget.value)
+            budget.value = sp.as_nat(budget.value - sp.max(tallied.value, 1))
+            # move on once every claim of the event is tallied
+            sp.if (~self.data.event.events[event_id].passed) | (self.data.event.events[event_id].tallied_count == event_data.claim_count):
+                self.data.rollover.event_cursor += 1
+
+    def finalize_reactivate_(self, batch_size):
+        self.zero_tez()
+        sp.set_type(batch_size, sp.TNat)
+        sp.verify(self.data.rollover.in_progress, "REACTIVATE_NOT_BEGUN")
+        sp.verify(self.data.rollover.event_cursor == self.data.event.next_event_id, "EVENTS_NOT_PROCESSED")
+
+        sp.if self.data.rollover.token_id.is_none():
+            # check limitation
+            sp.verify(self.data.rollover.holder_count >= self.data.threshold.minimum_count, "NEW_ST_HOLDER_COUNT_INSUFFICIENT")
+
+            # generate st token ID
+            self.data.rollover.token_id = sp.some(sp.view(
+                "get_next_stewardship_token_id", 
+                self.data.stewardship_token.fa2, 
+                sp.unit, 
+                sp.TNat
+            ).open_some("open get_next_stewardship_token_id view Error"))
+
+            # generate stewardship metadata
+            stewardship_token_metadata = sp.compute(stewardship_token_info(
+                self.data.token_templates.stewardship,
+                generation_label(self.data.info.generation + 1),
+                self.data.info.name,
+                self.data.info.description,
+                sp.self_address
+            ))
+            
+            # create stewardship token
+            c_create_fa2 = sp.contract(
+                sp.TList(
+                    sp.TRecord(
+                        is_stewardship = sp.TBool,
+                        minter = sp.TAddress,
+                        token_info = sp.TMap(sp.TString, sp.TBytes)
+                    )
+                ), 
+                self.data.stewardship_token.fa2, 
+                entry_point = "create_token").open_some()
+            sp.transfer(
+                sp.list([
+                    sp.record(
+                        is_stewardship = True,
+                        minter = sp.self_address,
+                        token_info = stewardship_token_metadata
+                    )
+                ]), 
+                sp.mutez(0), 
+                c_create_fa2
+            )
 
-        # generate st token ID
-        self.data.stewardship_token.id = sp.view(
-            "get_next_stewardship_token_id", 
-            self.data.stewardship_token.fa2, 
-            sp.unit, 
-            sp.TNat
-        ).open_some("open get_next_stewardship_token_id view Error")
-
-        # generate stewardship metadata
-        stewardship_token_metadata = sp.view(
-            "gen_stewardship_token", 
-            self.data.addresses.token_metadata_generator, 
-            sp.record(
-                generation = self.data.info.generation + 1,
-                multisig_name = self.data.info.name,
-                multisig_description = self.data.info.description,
-                creator = sp.self_address
-            ), 
-            sp.TMap(sp.TString, sp.TBytes)
-        ).open_some("open gen_stewardship_token view Error")
-        
-        # create stewardship token
-        c_create_fa2 = sp.contract(
-            sp.TList(
-                sp.TRecord(
-                    is_stewardship = sp.TBool,
-                    minter = sp.TAddress,
-                    token_info = sp.TMap(sp.TString, sp.TBytes)
-                )
-            ), 
-            self.data.stewardship_token.fa2, 
-            entry_point = "create_token").open_some()
-        sp.transfer(
-            sp.list([
-                sp.record(
-                    is_stewardship = True,
-                    minter = sp.self_address,
-                    token_info = stewardship_token_metadata
-                )
-            ]), 
-            sp.mutez(0), 
-            c_create_fa2
-        )
+        new_token_id = sp.compute(self.data.rollover.token_id.open_some("open token_id Error"))
 
+        # mint the next batch_size holders
         mintList = sp.local("mintList", sp.list([]))
-        sp.for stHolder in newStHolders.value.items():
+        sp.while (sp.len(mintList.value) < batch_size) & (self.data.rollover.mint_cursor < self.data.rollover.holder_count):
+            holder = sp.compute(self.data.rollover.holders[(self.data.info.generation, self.data.rollover.mint_cursor)])
             mintList.value.push(
                 sp.record(
-                    address = stHolder.key,
-                    amount = stHolder.value,
-                    token_id = self.data.stewardship_token.id
+                    address = holder,
+                    amount = self.data.rollover.tally[(self.data.info.generation, holder)],
+                    token_id = new_token_id
                 )
             )
-
-        c_mint_fa2 = sp.contract(
-            sp.TList(
-                sp.TRecord(
-                    address = sp.TAddress,
-                    amount = sp.TNat,
-                    token_id = sp.TNat
-                )
-            ), 
-            self.data.event.event_token_fa2, 
-            entry_point = "mint").open_some()
-        sp.transfer(
-            mintList.value, 
-            sp.mutez(0), 
-            c_mint_fa2
-        )
+            self.data.rollover.mint_cursor += 1
+
+        sp.if sp.len(mintList.value) > 0:
+            c_mint_fa2 = sp.contract(
+                sp.TList(
+                    sp.TRecord(
+                        address = sp.TAddress,
+                        amount = sp.TNat,
+                        token_id = sp.TNat
+                    )
+                ), 
+                self.data.stewardship_token.fa2, 
+                entry_point = "mint").open_some()
+            sp.transfer(
+                mintList.value, 
+                sp.mutez(0), 
+                c_mint_fa2
+            )
         
-        # set to new generation
-        self.data.timestamp.generation_start_time = sp.now
-        self.data.timestamp.generation_end_time = sp.now.add_minutes(self.data.info.generation_duration_minute)
-        self.data.info.generation += 1
-        self.data.event.event_id_list = sp.list([])
+        sp.if self.data.rollover.mint_cursor == self.data.rollover.holder_count:
+            # set to new generation
+            self.data.stewardship_token.id = new_token_id
+            self.data.stewardship_token.holder_count = self.data.rollover.holder_count
+            self.data.timestamp.generation_start_time = sp.now
+            self.data.timestamp.generation_end_time = sp.now.add_minutes(self.data.info.generation_duration_minute)
+            self.data.info.generation += 1
+            self.data.event.generation_first_event_id = self.data.event.next_event_id
+            self.data.rollover.holder_count = 0
+            self.data.rollover.in_progress = False
+
+
+class MultiSigViews:
+    """(Mixin) Views of a river, shared by MultiSig and MultiSigProxy."""
 
-    
     @sp.onchain_view()
     def is_alive(self):
         sp.result((self.data.info.generation > 0) & (sp.now <= self.data.timestamp.generation_end_time))
@@ -780,24 +1115,378 @@ class MultiSig(sp.Contract):
     @sp.onchain_view()
     def get_all_user(self):
         sp.result(sp.view("get_token_holders", self.data.stewardship_token.fa2, self.data.stewardship_token.id, sp.TSet(sp.TAddress)).open_some("open view Error"))
-        
-        
-@sp.add_test(name = "DID-MultiSig Test")
-def test():
-    scenario = sp.test_scenario()
+
+    @sp.onchain_view()
+    def get_all_user_page(self, params):
+        # a burn between two pages can move a holder to an already-read position, see get_token_holders_page
+        sp.set_type(params, sp.TRecord(offset = sp.TNat, limit = sp.TNat))
+        sp.result(sp.view(
+            "get_token_holders_page", 
+            self.data.stewardship_token.fa2, 
+            sp.record(
+                token_id = self.data.stewardship_token.id,
+                offset = params.offset,
+                limit = params.limit
+            ), 
+            sp.TList(sp.TAddress)
+        ).open_some("open get_token_holders_page view Error"))
+
+
+class MultiSig(MultiSigLogic, MultiSigViews, sp.Contract):
+    def __init__(self):
+        self.init_type(multisig_storage_type)
+        self.init(
+            info = sp.record(
+                name = sp.utils.bytes_of_string("River"),
+                description = sp.utils.bytes_of_string("This is a river."),
+                generation = sp.nat(0),
+                generation_duration_minute = sp.int(129600)
+            ),
+            addresses = sp.record(
+                factory = TokenFA2,
+                token_metadata_generator = TokenMetadataGenerator,
+                payload_generator = PayloadGenerator
+            ),
+            timestamp = sp.record(
+                create_time = sp.timestamp(0),
+                generation_start_time = sp.timestamp(0),
+                generation_end_time = sp.timestamp(0)
+            ),
+            event = sp.record(
+                event_token_fa2 = TokenFA2,
+                next_event_id = sp.nat(0),
+                generation_first_event_id = sp.nat(0),
+                events = sp.big_map(
+                    tkey = sp.TNat,
+                    tvalue = event_value_type
+                ),
+                claims = sp.big_map(
+                    tkey = sp.TPair(sp.TNat, sp.TAddress),
+                    tvalue = sp.TBytes
+                ),
+                claimants = sp.big_map(
+                    tkey = sp.TPair(sp.TNat, sp.TNat),
+                    tvalue = sp.TAddress
+                ),
+                approvals = sp.big_map(
+                    tkey = sp.TPair(sp.TNat, sp.TAddress),
+                    tvalue = sp.TUnit
+                )
+            ),
+            proposal = sp.record(
+                next_proposal_id = sp.nat(0),
+                proposals = sp.big_map(
+                    tkey = sp.TNat,
+                    tvalue = proposal_value_type
+                ),
+                approvals = sp.big_map(
+                    tkey = sp.TPair(sp.TNat, sp.TAddress),
+                    tvalue = sp.TUnit
+                )
+            ),
+            agreement_uri = sp.utils.bytes_of_string(MetadataUrl),
+            agreement_payload = sp.bytes("0x"),
+            dataset_uri = sp.utils.bytes_of_string(MetadataUrl),
+            token_templates = sp.record(
+                stewardship = sp.map(tkey = sp.TString, tvalue = sp.TBytes),
+                event = sp.map(tkey = sp.TString, tvalue = sp.TBytes)
+            ),
+            gen0_stewardship_receipts = sp.big_map(
+                tkey = sp.TAddress,
+                tvalue = sp.TBytes
+            ),
+            gen0_allowlist = sp.record(
+                root = sp.none,
+                claimed = sp.big_map(
+                    tkey = sp.TAddress,
+                    tvalue = sp.TUnit
+                )
+            ),
+            stewardship_token = sp.record(
+                fa2 = TokenFA2,
+                id = sp.nat(0),
+                holder_count = sp.nat(0)
+            ),
+            rollover = sp.record(
+                in_progress = False,
+                event_cursor = sp.nat(0),
+                tally = sp.big_map(
+                    tkey = sp.TPair(sp.TNat, sp.TAddress),
+                    tvalue = sp.TNat
+                ),
+                holders = sp.big_map(
+                    tkey = sp.TPair(sp.TNat, sp.TNat),
+                    tvalue = sp.TAddress
+                ),
+                holder_count = sp.nat(0),
+                mint_cursor = sp.nat(0),
+                token_id = sp.none
+            ),
+            threshold = sp.record(
+                ratio_number = 1,
+                ratio_total = 3,
+                minimum_count = 20
+            ),
+            metadata = sp.big_map({"":sp.utils.bytes_of_string(MetadataUrl)})
+        )
     
-    scenario.h1("DID-MultiSig contract")
-    c = MultiSig()
-    scenario += c
+    @sp.entry_point
+    def default(self):
+        pass
+
+    @sp.entry_point(lazify = True)
+    def create_proposal(self, content, reserve):
+        self.create_proposal_(content, reserve)
+
+    @sp.entry_point(lazify = True)
+    def sign_proposal(self, proposal_id):
+        self.sign_proposal_(proposal_id)
+
+    @sp.entry_point(lazify = True)
+    def sign_proposals(self, proposal_ids):
+        self.sign_proposals_(proposal_ids)
+
+    @sp.entry_point(lazify = True)
+    def sign_proposal_with_signatures(self, proposal_id, signatures):
+        self.sign_proposal_with_signatures_(proposal_id, signatures)
+
+    @sp.entry_point(lazify = True)
+    def resolve_proposal(self, proposal_id):
+        self.resolve_proposal_(proposal_id)
+
+    @sp.entry_point(lazify = True)
+    def create_event(self, name, description, edition):
+        self.create_event_(name, description, edition)
+
+    @sp.entry_point(lazify = True)
+    def refresh_token_templates(self):
+        self.refresh_token_templates_()
+
+    @sp.entry_point(lazify = True)
+    def claim_event(self, public_key, signature, event_id):
+        self.claim_event_(public_key, signature, event_id)
+
+    @sp.entry_point(lazify = True)
+    def claim_event_batch(self, event_id, claims):
+        self.claim_event_batch_(event_id, claims)
+
+    @sp.entry_point(lazify = True)
+    def approve_event(self, event_id):
+        self.approve_event_(event_id)
+
+    @sp.entry_point(lazify = True)
+    def approve_events(self, event_ids):
+        self.approve_events_(event_ids)
+
+    @sp.entry_point(lazify = True)
+    def claim_gen0_stewardship(self, public_key, signature):
+        self.claim_gen0_stewardship_(public_key, signature)
+
+    @sp.entry_point(lazify = True)
+    def claim_gen0_stewardship_with_proof(self, proof):
+        self.claim_gen0_stewardship_with_proof_(proof)
+
+    @sp.entry_point(lazify = True)
+    def activate(self):
+        self.activate_()
+
+    @sp.entry_point(lazify = True)
+    def begin_reactivate(self):
+        self.begin_reactivate_()
+
+    @sp.entry_point(lazify = True)
+    def process_reactivate(self, batch_size):
+        self.process_reactivate_(batch_size)
+
+    @sp.entry_point(lazify = True)
+    def finalize_reactivate(self, batch_size):
+        self.finalize_reactivate_(batch_size)
+
+
+class RiverLogicContext(MultiSigLogic):
+    """Runs MultiSigLogic against the storage passed to a river logic lambda."""
+
+    def __init__(self, data):
+        self.data = data
+
+
+def build_river_logic(entrypoint, params_type):
+    """Build the river logic lambda running `entrypoint(river, params)` on a proxy storage."""
+    def logic(params):
+        sp.set_type(params, sp.TRecord(params = sp.TBytes, storage = multisig_proxy_storage_type))
+        storage = sp.local("storage", params.storage)
+        entrypoint(RiverLogicContext(storage.value), sp.unpack(params.params, params_type).open_some("UNPACK_PARAMS_ERROR"))
+        sp.result(storage.value)
+
+    return sp.build_lambda(logic, with_operations = True)
+
+
+def build_river_logics():
+    """Return the river logic lambdas of every proxy entrypoint, keyed by entrypoint name."""
+    entrypoints = dict(
+        create_proposal = lambda river, params: river.create_proposal_(params.content, params.reserve),
+        sign_proposal = lambda river, params: river.sign_proposal_(params),
+        sign_proposals = lambda river, params: river.sign_proposals_(params),
+        sign_proposal_with_signatures = lambda river, params: river.sign_proposal_with_signatures_(params.proposal_id, params.signatures),
+        resolve_proposal = lambda river, params: river.resolve_proposal_(params),
+        create_event = lambda river, params: river.create_event_(params.name, params.description, params.edition),
+        claim_event = lambda river, params: river.claim_event_(params.public_key, params.signature, params.event_id),
+        claim_event_batch = lambda river, params: river.claim_event_batch_(params.event_id, params.claims),
+        approve_event = lambda river, params: river.approve_event_(params),
+        approve_events = lambda river, params: river.approve_events_(params),
+        claim_gen0_stewardship = lambda river, params: river.claim_gen0_stewardship_(params.public_key, params.signature),
+        claim_gen0_stewardship_with_proof = lambda river, params: river.claim_gen0_stewardship_with_proof_(params),
+        activate = lambda river, params: river.activate_(),
+        begin_reactivate = lambda river, params: river.begin_reactivate_(),
+        process_reactivate = lambda river, params: river.process_reactivate_(params),
+        finalize_reactivate = lambda river, params: river.finalize_reactivate_(params),
+        refresh_token_templates = lambda river, params: river.refresh_token_templates_()
+    )
+    return {name: build_river_logic(entrypoints[name], params_type) for name, params_type in river_entrypoint_types.items()}
+
+
+class RiverLogicStore(sp.Contract):
+    """Holds the river logic lambdas once for every proxy river, keyed by version and entrypoint."""
+
+    def __init__(self, admin, metadata):
+        self.init(
+            admin = admin,
+            version = sp.nat(0),
+            logics = sp.big_map(
+                tkey = sp.TPair(sp.TNat, sp.TString),
+                tvalue = river_logic_type
+            ),
+            metadata = metadata
+        )
+
+    def is_admin(self):
+        sp.verify(sp.sender == self.data.admin, "NOT_ADMIN")
+
+    @sp.entry_point
+    def default(self):
+        sp.send(sp.sender, sp.amount)
+
+    @sp.entry_point
+    def update_metadata(self, k, v):
+        self.is_admin()
+        self.data.metadata[k] = v
+
+    @sp.entry_point
+    def update_admin(self, admin):
+        self.is_admin()
+        self.data.admin = admin
+
+    @sp.entry_point
+    def update_logic(self, version, entrypoint, logic):
+        self.is_admin()
+        self.data.logics[(version, entrypoint)] = logic
+
+    @sp.entry_point
+    def update_version(self, version):
+        # switch every proxy river to the logics uploaded under version
+        self.is_admin()
+        self.data.version = version
+
+    @sp.onchain_view()
+    def get_logic(self, entrypoint):
+        sp.set_type(entrypoint, sp.TString)
+        sp.result(self.data.logics[(self.data.version, entrypoint)])
+
+
+class MultiSigProxy(MultiSigViews, sp.Contract):
+    """River that only keeps its own storage and runs the logic lambdas of logic_store.
+
+    Exposes the same entrypoints and views as MultiSig.
+    """
+
+    def __init__(self):
+        self.init_type(multisig_proxy_storage_type)
+        for name, params_type in river_entrypoint_types.items():
+            self.add_river_entrypoint(name, params_type)
+
+    def add_river_entrypoint(self, name, params_type):
+        def entrypoint(self, params):
+            sp.set_type(params, params_type)
+            self.run_logic(name, sp.pack(params))
+
+        setattr(self, name, sp.entry_point(entrypoint, name = name))
+
+    def run_logic(self, entrypoint, params):
+        logic = sp.view("get_logic", self.data.logic_store, entrypoint, river_logic_type).open_some("open get_logic view Error")
+        storage = sp.compute(logic(sp.record(params = params, storage = self.data)))
+        for field in multisig_storage_fields:
+            setattr(self.data, field, getattr(storage, field))
+
+    @sp.entry_point
+    def default(self):
+        pass
+
+
+# Tests
+AgreementUri = "ipfs://agreement"
+
+def signing_payload(data):
+    """Bytes PayloadGenerator.gen_payload returns for the hex string data."""
+    return sp.bytes("0x0501" + "%08x" % len(data) + data)
+
+AgreementPayload = signing_payload(AgreementUri.encode().hex())
+
+def setup_rivers(scenario, minimum_count):
+    """Originate the FA2, generators, logic store and factory a river runs against.
+
+    The other contracts are imported from this directory, run the tests from the repository root.
+    """
+    fa2 = sp.io.import_script_from_url("file:smartpy/tokenFA2.py")
+    metadata_generator = sp.io.import_script_from_url("file:smartpy/tokenMetadataGenerator.py")
+    payload_generator = sp.io.import_script_from_url("file:smartpy/payloadGenerator.py")
+
+    scenario.h2("Stewardship & Event token FA2")
+    c_fa2 = fa2.FungibleWithMint(
+        admin = Admin,
+        metadata = sp.utils.metadata_of_url(MetadataUrl),
+        lock_update = False,
+        policy = fa2.OwnerTransfer()
+    )
+    scenario += c_fa2
+
+    scenario.h2("Token Metadata Generator")
+    c_metadata_generator = metadata_generator.TokenMetadataGenerator(
+        sp.big_map({"admin": Admin}),
+        sp.map({
+            "symbol": sp.utils.bytes_of_string(metadata_generator.STEWARDSHIP_TOKEN_SYMBOL),
+            "artifactUri": sp.utils.bytes_of_string(metadata_generator.STEWARDSHIP_ARTIFACT_URI),
+            "displayUri": sp.utils.bytes_of_string(metadata_generator.STEWARDSHIP_DISPLAY_URI),
+            "thumbnailUri": sp.utils.bytes_of_string(metadata_generator.STEWARDSHIP_THUMBNAIL_URI)
+        }),
+        sp.map({
+            "symbol": sp.utils.bytes_of_string(metadata_generator.EVENT_TOKEN_SYMBOL),
+            "artifactUri": sp.utils.bytes_of_string(metadata_generator.EVENT_ARTIFACT_URI),
+            "displayUri": sp.utils.bytes_of_string(metadata_generator.EVENT_DISPLAY_URI),
+            "thumbnailUri": sp.utils.bytes_of_string(metadata_generator.EVENT_THUMBNAIL_URI)
+        }),
+        sp.big_map({"": sp.utils.bytes_of_string(MetadataUrl)})
+    )
+    scenario += c_metadata_generator
+
+    scenario.h2("Signing Payload Generator")
+    c_payload_generator = payload_generator.PayloadGenerator()
+    scenario += c_payload_generator
+
+    scenario.h2("River Logic Store")
+    c_logic_store = RiverLogicStore(Admin, sp.big_map(tkey = sp.TString, tvalue = sp.TBytes))
+    scenario += c_logic_store
+
+    for name, logic in build_river_logics().items():
+        c_logic_store.update_logic(version = 0, entrypoint = name, logic = logic).run(sender = Admin)
     
     scenario.h2("DID-Contract Factory")
-
     addressesMap = {}
     addressesMap["admin"] = Admin
-    addressesMap["stewardship_token_fa2"] = TokenFA2
-    addressesMap["event_token_fa2"] = TokenFA2
-    addressesMap["token_metadata_generator"] = TokenMetadataGenerator
-    addressesMap["payload_generator"] = PayloadGenerator
+    addressesMap["stewardship_token_fa2"] = c_fa2.address
+    addressesMap["event_token_fa2"] = c_fa2.address
+    addressesMap["token_metadata_generator"] = c_metadata_generator.address
+    addressesMap["payload_generator"] = c_payload_generator.address
+    addressesMap["river_logic_store"] = c_logic_store.address
 
     addresses = sp.big_map(
         tkey = sp.TString,
@@ -808,9 +1497,516 @@ def test():
     c_factory = MultiSigFactory(addresses)
     scenario += c_factory
 
-    # c_factory.create_multisig(
-    #     name = sp.utils.bytes_of_string("123River"), 
-    #     agreement_uri = sp.string("ipfs://agreement"), 
-    #     dataset_uri = sp.string("ipfs://prompt"), 
-    #     contract_metadata = sp.utils.bytes_of_string("ipfs://123River-metadata")
-    # )
\ No newline at end of file
+    c_fa2._update_factory(c_factory.address).run(sender = Admin)
+    # 10 minutes of gen0 claiming, generations of 100 minutes
+    c_factory._update_duration(sp.record(gen0 = sp.int(10), genX = sp.int(100))).run(sender = Admin)
+    c_factory._update_default_threshold(sp.record(ratio_number = 1, ratio_total = 3, minimum_count = minimum_count)).run(sender = Admin)
+    return c_fa2, c_factory, c_payload_generator, c_metadata_generator
+
+def create_river(scenario, c_factory, creator, allowlist_root = sp.none, dynamic_id = 0):
+    c_factory.create_multisig(
+        name = sp.utils.bytes_of_string("River"), 
+        description = sp.utils.bytes_of_string("This is a river."), 
+        agreement_uri = sp.utils.bytes_of_string(AgreementUri), 
+        dataset_uri = sp.utils.bytes_of_string("ipfs://dataset"), 
+        contract_metadata = sp.utils.bytes_of_string("ipfs://River-metadata"),
+        allowlist_root = allowlist_root
+    ).run(sender = creator, now = sp.timestamp(0))
+    return scenario.dynamic_contract(dynamic_id, c_factory.multi_sig)
+
+def stewardship_token_params(river, generation):
+    """TokenMetadataGenerator params of the stewardship token of a river made by create_river."""
+    return sp.record(
+        multisig_name = sp.utils.bytes_of_string("River"),
+        multisig_description = sp.utils.bytes_of_string("This is a river."),
+        generation = generation,
+        creator = river.address
+    )
+
+def event_token_params(river, name, generation):
+    """TokenMetadataGenerator params of an event token of a river made by create_river."""
+    return sp.record(
+        event_name = sp.utils.bytes_of_string(name),
+        event_description = sp.utils.bytes_of_string("This is an event."),
+        multisig_name = sp.utils.bytes_of_string("River"),
+        generation = generation,
+        creator = river.address
+    )
+
+def agreement_signature(account):
+    return sp.make_signature(account.secret_key, AgreementPayload, message_format = "Raw")
+
+def activate_river(river, stewards):
+    """Claim gen0 stewardship for stewards and start generation 1 at 700, it ends at 6700."""
+    for steward in stewards:
+        river.claim_gen0_stewardship(public_key = steward.public_key, signature = agreement_signature(steward)).run(sender = steward, now = sp.timestamp(100))
+    river.activate().run(now = sp.timestamp(700))
+
+def claim_event(river, account, event_id):
+    river.claim_event(public_key = account.public_key, signature = agreement_signature(account), event_id = event_id).run(sender = account, now = sp.timestamp(2000))
+
+def update_threshold(river, stewards, proposal_id, threshold):
+    river.create_proposal(content = sp.variant("update_threshold", threshold), reserve = {}).run(sender = stewards[0], now = sp.timestamp(3000))
+    for steward in stewards:
+        river.sign_proposal(proposal_id).run(sender = steward, now = sp.timestamp(3000))
+    river.resolve_proposal(proposal_id).run(now = sp.timestamp(3000))
+
+@sp.add_test(name = "DID-MultiSig Test")
+def test():
+    scenario = sp.test_scenario()
+    
+    scenario.h1("DID-MultiSig contract")
+    c = MultiSig()
+    scenario += c
+
+    c_fa2, c_factory, c_payload_generator, c_metadata_generator = setup_rivers(scenario, 3)
+
+    scenario.h2("River")
+    creator = sp.test_account("Creator")
+    river = create_river(scenario, c_factory, creator)
+    scenario.verify(c_factory.data.multisigs.contains(river.address))
+    scenario.verify(river.data.stewardship_token.id == 1)
+    # the factory fills the templates with the same bytes as the generator
+    scenario.verify(c_fa2.data.token_metadata[1].token_info == c_metadata_generator.gen_stewardship_token(stewardship_token_params(river, 1)))
+
+    # the lazy entrypoints are stored in the river's big_map at origination by the factory
+    scenario.h2("Lazy entrypoints of a factory-made river")
+    alice = sp.test_account("Alice")
+    bob = sp.test_account("Bob")
+    carol = sp.test_account("Carol")
+    stewards = [alice, bob, carol]
+    activate_river(river, stewards)
+    # stewards are listed in the order they claimed
+    scenario.verify(river.get_all_user_page(sp.record(offset = 0, limit = 2)) == [alice.address, bob.address])
+    scenario.verify(river.get_all_user_page(sp.record(offset = 2, limit = 2)) == [carol.address])
+    for proposal_id in range(2):
+        river.create_proposal(content = sp.variant("update_dataset_uri", sp.utils.bytes_of_string("ipfs://dataset-%d" % proposal_id)), reserve = {}).run(sender = alice, now = sp.timestamp(1000))
+    for steward in stewards:
+        river.sign_proposals([0, 1]).run(sender = steward, now = sp.timestamp(1000))
+    scenario.verify(river.data.proposal.proposals[1].approval_count == 3)
+    river.resolve_proposal(1).run(now = sp.timestamp(1000))
+    scenario.verify(river.data.dataset_uri == sp.utils.bytes_of_string("ipfs://dataset-1"))
+    for event_id in range(2):
+        river.create_event(name = sp.utils.bytes_of_string("Event %d" % event_id), description = sp.utils.bytes_of_string("This is an event."), edition = sp.some(1)).run(sender = alice, now = sp.timestamp(1000))
+    scenario.verify(c_fa2.data.token_metadata.contains(100002))
+    for event_id in range(2):
+        scenario.verify(c_fa2.data.token_metadata[100001 + event_id].token_info == c_metadata_generator.gen_event_token(event_token_params(river, "Event %d" % event_id, 1)))
+    for steward in stewards:
+        river.approve_events([0, 1]).run(sender = steward, now = sp.timestamp(1000))
+    scenario.verify(river.data.event.events[1].passed)
+    claim_event(river, bob, 0)
+    scenario.verify(river.data.event.events[0].amount == sp.some(0))
+    river.claim_event(public_key = carol.public_key, signature = agreement_signature(carol), event_id = 0).run(sender = carol, now = sp.timestamp(2000), valid = False, exception = "EVENT_EDITION_INSUFFICIENT")
+
+    scenario.h2("Refreshed token templates")
+    # a template update of the generator reaches the river once its copy is refreshed
+    c_metadata_generator.update_event_token(key = "symbol", value = sp.utils.bytes_of_string("EVETK2")).run(sender = Admin)
+    scenario.verify(river.data.token_templates.event != c_metadata_generator.data.event_token)
+    river.refresh_token_templates().run(sender = carol, now = sp.timestamp(2000))
+    scenario.verify(river.data.token_templates.event == c_metadata_generator.data.event_token)
+    river.create_event(name = sp.utils.bytes_of_string("Event 2"), description = sp.utils.bytes_of_string("This is an event."), edition = sp.none).run(sender = alice, now = sp.timestamp(2000))
+    scenario.verify(c_fa2.data.token_metadata[100003].token_info == c_metadata_generator.gen_event_token(event_token_params(river, "Event 2", 1)))
+
+@sp.add_test(name = "River rollover")
+def test():
+    scenario = sp.test_scenario()
+    scenario.h1("River rollover")
+    c_fa2, c_factory, c_payload_generator, c_metadata_generator = setup_rivers(scenario, 3)
+
+    alice = sp.test_account("Alice")
+    bob = sp.test_account("Bob")
+    carol = sp.test_account("Carol")
+    stewards = [alice, bob, carol]
+    claimants = [sp.test_account("Claimant %d" % i) for i in range(6)]
+
+    river = create_river(scenario, c_factory, alice)
+    activate_river(river, stewards)
+    scenario.verify(river.data.info.generation == 1)
+    scenario.verify(river.data.stewardship_token.holder_count == 3)
+
+    scenario.h2("Generation 1 events")
+    for event_id in range(3):
+        river.create_event(name = sp.utils.bytes_of_string("Event %d" % event_id), description = sp.utils.bytes_of_string("This is an event."), edition = sp.none).run(sender = alice, now = sp.timestamp(1000))
+    event_claimants = {0: claimants[0:5], 1: [claimants[0], claimants[1], claimants[5]], 2: [claimants[2]]}
+    for event_id, accounts in event_claimants.items():
+        for account in accounts:
+            claim_event(river, account, event_id)
+
+    # event 0 misses the minimum count of 3, event 1 passes and tallies its claims, event 2 is never approved
+    for steward in [alice, bob]:
+        river.approve_event(0).run(sender = steward, now = sp.timestamp(2500))
+    for steward in stewards:
+        river.approve_event(1).run(sender = steward, now = sp.timestamp(2500))
+    scenario.verify(~river.data.event.events[0].passed)
+    scenario.verify(river.data.event.events[1].passed)
+    scenario.verify(river.data.event.events[1].tallied_count == 3)
+
+    # event 0 now reaches the threshold, it passes while the rollover processes it
+    update_threshold(river, stewards, 0, sp.record(ratio_number = 1, ratio_total = 3, minimum_count = 2))
+
+    scenario.h2("Rollover")
+    river.process_reactivate(2).run(now = sp.timestamp(7000), valid = False, exception = "REACTIVATE_NOT_BEGUN")
+    river.begin_reactivate().run(now = sp.timestamp(6000), valid = False, exception = "STILL_IN_GENERATION_TIME")
+    river.begin_reactivate().run(now = sp.timestamp(7000))
+    river.begin_reactivate().run(now = sp.timestamp(7000), valid = False, exception = "REACTIVATE_IN_PROGRESS")
+
+    # event 0 has 5 claims to tally, 2 per call
+    river.process_reactivate(2).run(now = sp.timestamp(7000))
+    scenario.verify(river.data.event.events[0].passed)
+    scenario.verify(river.data.event.events[0].tallied_count == 2)
+    scenario.verify(river.data.rollover.event_cursor == 0)
+    river.process_reactivate(2).run(now = sp.timestamp(7000))
+    scenario.verify(river.data.event.events[0].tallied_count == 4)
+    scenario.verify(river.data.rollover.event_cursor == 0)
+    # the last claim of event 0 and the already tallied event 1
+    river.process_reactivate(2).run(now = sp.timestamp(7000))
+    scenario.verify(river.data.event.events[0].tallied_count == 5)
+    scenario.verify(river.data.rollover.event_cursor == 2)
+    river.finalize_reactivate(4).run(now = sp.timestamp(7000), valid = False, exception = "EVENTS_NOT_PROCESSED")
+    # event 2 never passed
+    river.process_reactivate(2).run(now = sp.timestamp(7000))
+    scenario.verify(~river.data.event.events[2].passed)
+    scenario.verify(river.data.rollover.event_cursor == 3)
+
+    # passed events claimed, as the previous reactivate counted them
+    expected = {0: 2, 1: 2, 2: 1, 3: 1, 4: 1, 5: 1}
+    scenario.verify(river.data.rollover.holder_count == len(expected))
+    for index, count in expected.items():
+        scenario.verify(river.data.rollover.tally[(1, claimants[index].address)] == count)
+
+    # the new token is created once and minted over two calls
+    river.finalize_reactivate(4).run(now = sp.timestamp(7000))
+    scenario.verify(river.data.rollover.token_id == sp.some(2))
+    scenario.verify(river.data.rollover.mint_cursor == 4)
+    scenario.verify(river.data.info.generation == 1)
+    river.finalize_reactivate(4).run(now = sp.timestamp(7100))
+    scenario.verify(c_fa2.data.next_stewardship_token_id == 3)
+    for index, count in expected.items():
+        scenario.verify(c_fa2.data.ledger[(claimants[index].address, 2)] == count)
+    scenario.verify(c_fa2.data.holder_count[2] == len(expected))
+
+    scenario.verify(river.data.info.generation == 2)
+    scenario.verify(river.data.stewardship_token.id == 2)
+    scenario.verify(c_fa2.data.token_metadata[2].token_info == c_metadata_generator.gen_stewardship_token(stewardship_token_params(river, 2)))
+    scenario.verify(river.data.stewardship_token.holder_count == len(expected))
+    scenario.verify(river.data.event.generation_first_event_id == 3)
+    scenario.verify(river.data.timestamp.generation_end_time == sp.timestamp(7100).add_minutes(100))
+    scenario.verify(~river.data.rollover.in_progress)
+    scenario.verify(river.data.rollover.holder_count == 0)
+
+@sp.add_test(name = "Stewardship tally")
+def test():
+    scenario = sp.test_scenario()
+    scenario.h1("Stewardship tally")
+    c_fa2, c_factory, c_payload_generator, c_metadata_generator = setup_rivers(scenario, 3)
+
+    alice = sp.test_account("Alice")
+    bob = sp.test_account("Bob")
+    carol = sp.test_account("Carol")
+    stewards = [alice, bob, carol]
+    claimants = [sp.test_account("Claimant %d" % i) for i in range(ApprovalTallyLimit + 5)]
+
+    river = create_river(scenario, c_factory, alice)
+    activate_river(river, stewards)
+    for event_id in range(3):
+        river.create_event(name = sp.utils.bytes_of_string("Event %d" % event_id), description = sp.utils.bytes_of_string("This is an event."), edition = sp.none).run(sender = alice, now = sp.timestamp(1000))
+
+    scenario.h2("Event passing with more claims than ApprovalTallyLimit")
+    for account in claimants:
+        claim_event(river, account, 0)
+    for steward in stewards:
+        river.approve_event(0).run(sender = steward, now = sp.timestamp(2500))
+    scenario.verify(river.data.event.events[0].passed)
+    scenario.verify(river.data.event.events[0].tallied_count == ApprovalTallyLimit)
+    scenario.verify(river.data.rollover.holder_count == ApprovalTallyLimit)
+
+    scenario.h2("Claims on an already passed event")
+    for steward in stewards:
+        river.approve_event(1).run(sender = steward, now = sp.timestamp(2500))
+    scenario.verify(river.data.event.events[1].passed)
+    scenario.verify(river.data.event.events[1].tallied_count == 0)
+    for account in claimants[0:2]:
+        claim_event(river, account, 1)
+    scenario.verify(river.data.event.events[1].tallied_count == 2)
+    scenario.verify(river.data.rollover.tally[(1, claimants[0].address)] == 2)
+
+    scenario.h2("Event passing in process_reactivate after a threshold update")
+    for account in claimants[2:4]:
+        claim_event(river, account, 2)
+    for steward in [alice, bob]:
+        river.approve_event(2).run(sender = steward, now = sp.timestamp(2500))
+    scenario.verify(~river.data.event.events[2].passed)
+    update_threshold(river, stewards, 0, sp.record(ratio_number = 1, ratio_total = 3, minimum_count = 2))
+    scenario.verify(~river.data.event.events[2].passed)
+
+    river.begin_reactivate().run(now = sp.timestamp(7000))
+    river.process_reactivate(1000).run(now = sp.timestamp(7000))
+    scenario.verify(river.data.event.events[0].tallied_count == ApprovalTallyLimit + 5)
+    scenario.verify(river.data.event.events[2].passed)
+    scenario.verify(river.data.event.events[2].tallied_count == 2)
+    scenario.verify(river.data.rollover.event_cursor == 3)
+
+    # every event passed at the rollover, so the previous reactivate counted every claim
+    expected = [1 + (1 if i < 4 else 0) for i in range(len(claimants))]
+    scenario.verify(river.data.rollover.holder_count == len(claimants))
+    for account, count in zip(claimants, expected):
+        scenario.verify(river.data.rollover.tally[(1, account.address)] == count)
+
+    river.finalize_reactivate(len(claimants)).run(now = sp.timestamp(7000))
+    scenario.verify(river.data.info.generation == 2)
+    for account, count in zip(claimants, expected):
+        scenario.verify(c_fa2.data.ledger[(account.address, 2)] == count)
+
+
+@sp.add_test(name = "Batched river creation")
+def test():
+    scenario = sp.test_scenario()
+    scenario.h1("Batched river creation")
+    c_fa2, c_factory, c_payload_generator, c_metadata_generator = setup_rivers(scenario, 1)
+
+    creator = sp.test_account("Creator")
+    stewards = [sp.test_account("Steward %d" % index) for index in range(3)]
+    names = ["River %d" % index for index in range(3)]
+    c_factory.create_multisigs([
+        sp.record(
+            name = sp.utils.bytes_of_string(name), 
+            description = sp.utils.bytes_of_string("This is a river."), 
+            agreement_uri = sp.utils.bytes_of_string(AgreementUri), 
+            dataset_uri = sp.utils.bytes_of_string("ipfs://dataset"), 
+            contract_metadata = sp.utils.bytes_of_string("ipfs://River-metadata"),
+            allowlist_root = sp.none
+        ) for name in names
+    ]).run(sender = creator, now = sp.timestamp(0))
+    scenario.verify(c_fa2.data.next_stewardship_token_id == 1 + len(names))
+
+    # the rivers are originated in list order and the FA2 gives their gen0 tokens consecutive ids in the same order
+    for index, name in enumerate(names):
+        river = scenario.dynamic_contract(index, c_factory.multi_sig)
+        token_id = index + 1
+        scenario.verify(c_factory.data.multisigs[river.address].name == sp.utils.bytes_of_string(name))
+        scenario.verify(river.data.stewardship_token.id == token_id)
+        scenario.verify(c_fa2.data.token_minter[token_id] == river.address)
+        scenario.verify(c_fa2.data.token_metadata[token_id].token_info["name"] == sp.utils.bytes_of_string("[STEWARDSHIP TOKEN GEN-1] " + name))
+        river.claim_gen0_stewardship(public_key = stewards[index].public_key, signature = agreement_signature(stewards[index])).run(sender = stewards[index], now = sp.timestamp(100))
+        scenario.verify(c_fa2.data.ledger[(stewards[index].address, token_id)] == 1)
+
+@sp.add_test(name = "Proxy river")
+def test():
+    scenario = sp.test_scenario()
+    scenario.h1("Proxy river")
+    c_fa2, c_factory, c_payload_generator, c_metadata_generator = setup_rivers(scenario, 2)
+
+    alice = sp.test_account("Alice")
+    bob = sp.test_account("Bob")
+    stewards = [alice, bob]
+
+    c_factory.create_multisig_proxy(
+        name = sp.utils.bytes_of_string("Proxy River"), 
+        description = sp.utils.bytes_of_string("This is a proxy river."), 
+        agreement_uri = sp.utils.bytes_of_string(AgreementUri), 
+        dataset_uri = sp.utils.bytes_of_string("ipfs://dataset"), 
+        contract_metadata = sp.utils.bytes_of_string("ipfs://Proxy-River-metadata"),
+        allowlist_root = sp.none
+    ).run(sender = alice, now = sp.timestamp(0))
+    proxy = scenario.dynamic_contract(0, c_factory.multi_sig_proxy)
+    scenario.verify(proxy.data.logic_store == c_factory.data.addresses["river_logic_store"])
+
+    scenario.h2("Gen0 stewardship through the logic lambdas")
+    proxy.claim_gen0_stewardship(public_key = alice.public_key, signature = agreement_signature(bob)).run(sender = alice, now = sp.timestamp(100), valid = False, exception = "SIGNATURE_NOT_MATCHED")
+    activate_river(proxy, stewards)
+    scenario.verify(c_fa2.data.ledger[(alice.address, 1)] == 1)
+    scenario.verify(proxy.data.gen0_stewardship_receipts.contains(bob.address))
+    scenario.verify(proxy.data.info.generation == 1)
+    scenario.verify(proxy.data.stewardship_token.holder_count == 2)
+    # the views come from MultiSigViews as on MultiSig
+    scenario.verify(proxy.get_all_user_page(sp.record(offset = 1, limit = 5)) == [bob.address])
+
+    scenario.h2("Proposals through the logic lambdas")
+    proxy.create_proposal(content = sp.variant("update_dataset_uri", sp.utils.bytes_of_string("ipfs://dataset-2")), reserve = {}).run(sender = alice, now = sp.timestamp(1000))
+    scenario.verify(proxy.data.proposal.proposals[0].proposer == alice.address)
+    proxy.sign_proposal(0).run(sender = bob, now = sp.timestamp(1000))
+    proxy.sign_proposal(0).run(sender = bob, now = sp.timestamp(1000), valid = False, exception = "PROPOSAL_APPROVED_ALREADY")
+    proxy.resolve_proposal(0).run(now = sp.timestamp(1000), valid = False, exception = "NOT_REACH_THRESHOLD")
+    proxy.sign_proposal(0).run(sender = alice, now = sp.timestamp(1000))
+    scenario.verify(proxy.data.proposal.approvals.contains((0, bob.address)))
+    proxy.resolve_proposal(0).run(now = sp.timestamp(1000))
+    scenario.verify(proxy.data.dataset_uri == sp.utils.bytes_of_string("ipfs://dataset-2"))
+    scenario.verify(proxy.data.proposal.proposals[0].is_resolved)
+
+    scenario.h2("Events through the logic lambdas")
+    proxy.create_event(name = sp.utils.bytes_of_string("Event"), description = sp.utils.bytes_of_string("This is an event."), edition = sp.none).run(sender = alice, now = sp.timestamp(1000))
+    # the lambda runs with the proxy as self_address
+    scenario.verify(c_fa2.data.token_minter[100001] == proxy.address)
+    claim_event(proxy, bob, 0)
+    scenario.verify(c_fa2.data.ledger[(bob.address, 100001)] == 1)
+    scenario.verify(proxy.data.event.claimants[(0, 0)] == bob.address)
+
+@sp.add_test(name = "Relayed event claims")
+def test():
+    scenario = sp.test_scenario()
+    scenario.h1("Relayed event claims")
+    c_fa2, c_factory, c_payload_generator, c_metadata_generator = setup_rivers(scenario, 2)
+
+    alice = sp.test_account("Alice")
+    bob = sp.test_account("Bob")
+    relayer = sp.test_account("Relayer")
+    claimants = [sp.test_account("Claimant %d" % i) for i in range(3)]
+
+    river = create_river(scenario, c_factory, alice)
+    activate_river(river, [alice, bob])
+    for event_id in range(2):
+        river.create_event(name = sp.utils.bytes_of_string("Event %d" % event_id), description = sp.utils.bytes_of_string("This is an event."), edition = sp.none).run(sender = alice, now = sp.timestamp(1000))
+
+    def claim_signature(account, event_id, agreement_uri = AgreementUri):
+        payload = scenario.compute(c_payload_generator.gen_payload(sp.pack((river.address, sp.string("claim_event"), sp.utils.bytes_of_string(agreement_uri), sp.nat(event_id), sp.nat(1)))))
+        return sp.make_signature(account.secret_key, payload, message_format = "Raw")
+
+    scenario.h2("Claims signed for the event")
+    river.claim_event_batch(
+        event_id = 0,
+        claims = [(account.public_key, claim_signature(account, 0)) for account in claimants[0:2]]
+    ).run(sender = relayer, now = sp.timestamp(2000))
+    for account in claimants[0:2]:
+        scenario.verify(c_fa2.data.ledger[(account.address, 100001)] == 1)
+    scenario.verify(river.data.event.events[0].claim_count == 2)
+
+    scenario.h2("Replayed signatures are rejected")
+    # the agreement signature is public after a claim_event of its signer
+    claim_event(river, claimants[2], 0)
+    river.claim_event_batch(
+        event_id = 1,
+        claims = [(claimants[2].public_key, agreement_signature(claimants[2]))]
+    ).run(sender = relayer, now = sp.timestamp(2000), valid = False, exception = "SIGNATURE_NOT_MATCHED")
+    # a claim signed for one event does not claim another
+    river.claim_event_batch(
+        event_id = 1,
+        claims = [(claimants[0].public_key, claim_signature(claimants[0], 0))]
+    ).run(sender = relayer, now = sp.timestamp(2000), valid = False, exception = "SIGNATURE_NOT_MATCHED")
+    river.claim_event_batch(
+        event_id = 0,
+        claims = [(claimants[0].public_key, claim_signature(claimants[0], 0))]
+    ).run(sender = relayer, now = sp.timestamp(2000), valid = False, exception = "CANNOT_CLAIM_TWICE")
+
+    scenario.h2("Claims signed for a stale agreement are rejected")
+    new_agreement_uri = "ipfs://agreement-2"
+    river.create_proposal(content = sp.variant("update_agreement_uri", sp.utils.bytes_of_string(new_agreement_uri)), reserve = {}).run(sender = alice, now = sp.timestamp(3000))
+    for steward in [alice, bob]:
+        river.sign_proposal(0).run(sender = steward, now = sp.timestamp(3000))
+    river.resolve_proposal(0).run(now = sp.timestamp(3000))
+    scenario.verify(river.data.agreement_uri == sp.utils.bytes_of_string(new_agreement_uri))
+    river.claim_event_batch(
+        event_id = 1,
+        claims = [(claimants[1].public_key, claim_signature(claimants[1], 1))]
+    ).run(sender = relayer, now = sp.timestamp(3000), valid = False, exception = "SIGNATURE_NOT_MATCHED")
+    river.claim_event_batch(
+        event_id = 1,
+        claims = [(claimants[1].public_key, claim_signature(claimants[1], 1, new_agreement_uri))]
+    ).run(sender = relayer, now = sp.timestamp(3000))
+    scenario.verify(c_fa2.data.ledger[(claimants[1].address, 100002)] == 1)
+
+@sp.add_test(name = "Relayed proposal approvals")
+def test():
+    scenario = sp.test_scenario()
+    scenario.h1("Relayed proposal approvals")
+    c_fa2, c_factory, c_payload_generator, c_metadata_generator = setup_rivers(scenario, 3)
+
+    alice = sp.test_account("Alice")
+    bob = sp.test_account("Bob")
+    carol = sp.test_account("Carol")
+    dave = sp.test_account("Dave")
+    relayer = sp.test_account("Relayer")
+
+    river = create_river(scenario, c_factory, alice)
+    other_river = create_river(scenario, c_factory, alice, dynamic_id = 1)
+    activate_river(river, [alice, bob, carol])
+    for proposal_id in range(2):
+        river.create_proposal(content = sp.variant("update_dataset_uri", sp.utils.bytes_of_string("ipfs://dataset-%d" % proposal_id)), reserve = {}).run(sender = alice, now = sp.timestamp(1000))
+
+    def approval_signature(account, proposal_id, river_address = river.address, generation = 1):
+        payload = scenario.compute(c_payload_generator.gen_payload(sp.pack((river_address, sp.string("sign_proposal"), sp.nat(proposal_id), sp.nat(generation)))))
+        return sp.make_signature(account.secret_key, payload, message_format = "Raw")
+
+    def sign_with_signatures(proposal_id, signatures, **run_args):
+        river.sign_proposal_with_signatures(proposal_id = proposal_id, signatures = signatures).run(sender = relayer, now = sp.timestamp(1000), **run_args)
+
+    scenario.h2("Approvals signed for the proposal")
+    sign_with_signatures(0, [(account.public_key, approval_signature(account, 0)) for account in [alice, bob]])
+    scenario.verify(river.data.proposal.approvals.contains((0, alice.address)))
+    scenario.verify(river.data.proposal.approvals.contains((0, bob.address)))
+    scenario.verify(river.data.proposal.proposals[0].approval_count == 2)
+
+    scenario.h2("Rejected approvals")
+    # signed for another proposal, generation or river
+    sign_with_signatures(0, [(carol.public_key, approval_signature(carol, 1))], valid = False, exception = "SIGNATURE_NOT_MATCHED")
+    sign_with_signatures(0, [(carol.public_key, approval_signature(carol, 0, generation = 2))], valid = False, exception = "SIGNATURE_NOT_MATCHED")
+    sign_with_signatures(0, [(carol.public_key, approval_signature(carol, 0, river_address = other_river.address))], valid = False, exception = "SIGNATURE_NOT_MATCHED")
+    # an agreement signature is not an approval
+    sign_with_signatures(0, [(carol.public_key, agreement_signature(carol))], valid = False, exception = "SIGNATURE_NOT_MATCHED")
+    # a signer without the stewardship token
+    sign_with_signatures(0, [(dave.public_key, approval_signature(dave, 0))], valid = False, exception = "NO_OWNING_STEWARDSHIP_TOKEN")
+    # a signer who approved already, in an earlier call or twice in one call
+    sign_with_signatures(0, [(alice.public_key, approval_signature(alice, 0))], valid = False, exception = "PROPOSAL_APPROVED_ALREADY")
+    sign_with_signatures(1, [(carol.public_key, approval_signature(carol, 1))] * 2, valid = False, exception = "PROPOSAL_APPROVED_ALREADY")
+    scenario.verify(river.data.proposal.proposals[0].approval_count == 2)
+    scenario.verify(river.data.proposal.proposals[1].approval_count == 0)
+
+    sign_with_signatures(0, [(carol.public_key, approval_signature(carol, 0))])
+    scenario.verify(river.data.proposal.proposals[0].approval_count == 3)
+    river.resolve_proposal(0).run(now = sp.timestamp(1000))
+    scenario.verify(river.data.dataset_uri == sp.utils.bytes_of_string("ipfs://dataset-0"))
+
+@sp.add_test(name = "Gen0 allowlist")
+def test():
+    scenario = sp.test_scenario()
+    scenario.h1("Gen0 allowlist")
+    c_fa2, c_factory, c_payload_generator, c_metadata_generator = setup_rivers(scenario, 2)
+
+    alice = sp.test_account("Alice")
+    bob = sp.test_account("Bob")
+    carol = sp.test_account("Carol")
+    dave = sp.test_account("Dave")
+    eve = sp.test_account("Eve")
+
+    # two-level tree of the four members, each node hashes its two children in sorted order
+    def merkle_node(a, b):
+        return scenario.compute(sp.eif(a < b, sp.blake2b(a + b), sp.blake2b(b + a)))
+    leaves = [scenario.compute(sp.blake2b(sp.pack(member.address))) for member in [alice, bob, carol, dave]]
+    node01 = merkle_node(leaves[0], leaves[1])
+    node23 = merkle_node(leaves[2], leaves[3])
+    root = merkle_node(node01, node23)
+
+    river = create_river(scenario, c_factory, alice, sp.some(root))
+    scenario.verify(river.data.gen0_allowlist.root == sp.some(root))
+
+    scenario.h2("Valid proof")
+    river.claim_gen0_stewardship_with_proof([leaves[1], node23]).run(sender = alice, now = sp.timestamp(100))
+    scenario.verify(river.data.gen0_allowlist.claimed.contains(alice.address))
+    scenario.verify(c_fa2.data.ledger[(alice.address, 1)] == 1)
+
+    scenario.h2("Rejected claims")
+    # wrong sibling at the first level
+    river.claim_gen0_stewardship_with_proof([leaves[2], node23]).run(sender = bob, now = sp.timestamp(100), valid = False, exception = "NOT_IN_ALLOWLIST")
+    # someone else's proof
+    river.claim_gen0_stewardship_with_proof([leaves[1], node23]).run(sender = eve, now = sp.timestamp(100), valid = False, exception = "NOT_IN_ALLOWLIST")
+    # second claim, with the proof or with a signature
+    river.claim_gen0_stewardship_with_proof([leaves[1], node23]).run(sender = alice, now = sp.timestamp(100), valid = False, exception = "CANNOT_CLAIM_TWICE")
+    river.claim_gen0_stewardship(public_key = alice.public_key, signature = agreement_signature(alice)).run(sender = alice, now = sp.timestamp(100), valid = False, exception = "CANNOT_CLAIM_TWICE")
+
+    river.claim_gen0_stewardship_with_proof([leaves[3], node01]).run(sender = carol, now = sp.timestamp(100))
+    river.claim_gen0_stewardship_with_proof([leaves[2], node01]).run(sender = dave, now = sp.timestamp(700), valid = False, exception = "CLAIM_EXPIRED")
+    river.activate().run(now = sp.timestamp(700))
+    scenario.verify(river.data.stewardship_token.holder_count == 2)
+
+sp.add_compilation_target("MultiSig", MultiSig())
+sp.add_compilation_target("RiverLogicStore", RiverLogicStore(Admin, sp.big_map(tkey = sp.TString, tvalue = sp.TBytes)))
+sp.add_compilation_target("MultiSigFactory", MultiSigFactory(sp.big_map(
+    tkey = sp.TString,
+    tvalue = sp.TAddress,
+    l = {
+        "admin": Admin,
+        "stewardship_token_fa2": TokenFA2,
+        "event_token_fa2": TokenFA2,
+        "token_metadata_generator": TokenMetadataGenerator,
+        "payload_generator": PayloadGenerator
+    }
+)))
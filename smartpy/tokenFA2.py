@@ -343,8 +343,13 @@ class Fa2Fungible(Common):
                 ledger, tkey=sp.TPair(sp.TAddress, sp.TNat), tvalue=sp.TNat
             ),
             metadata=sp.set_type_expr(metadata, sp.TBigMap(sp.TString, sp.TBytes)),
-            token_holders=sp.big_map(tkey=sp.TNat, tvalue=sp.TSet(sp.TAddress)),
+            token_holders=sp.big_map(tkey=sp.TPair(sp.TNat, sp.TAddress), tvalue=sp.TNat),
+            holder_index=sp.big_map(tkey=sp.TPair(sp.TNat, sp.TNat), tvalue=sp.TAddress),
+            holder_count=sp.big_map(tkey=sp.TNat, tvalue=sp.TNat),
             token_minter=sp.big_map(tkey=sp.TNat, tvalue=sp.TAddress),
+            token_templates=sp.big_map(tkey=sp.TNat, tvalue=sp.TMap(sp.TString, sp.TBytes)),
+            token_template_ids=sp.big_map(tkey=sp.TNat, tvalue=sp.TNat),
+            active_token_templates=sp.map(tkey=sp.TBool, tvalue=sp.TNat),
             burn_address=sp.address("tz1burnburnburnburnburnburnburjAYjjX"),
             factory=factory,
             next_stewardship_token_id=sp.nat(1),
@@ -379,6 +384,24 @@ class Fa2Fungible(Common):
     #     sp.verify(self.is_defined(token_id), "FA2_TOKEN_UNDEFINED")
     #     return self.data.supply.get(token_id, sp.nat(0))
 
+    def add_holder_(self, holder, token_id):
+        """Append `holder` to the holder index of `token_id`."""
+        index = sp.compute(self.data.holder_count.get(token_id, 0))
+        self.data.token_holders[(token_id, holder)] = index
+        self.data.holder_index[(token_id, index)] = holder
+        self.data.holder_count[token_id] = index + 1
+
+    def remove_holder_(self, holder, token_id):
+        """Move the last holder of `token_id` into the slot of `holder`."""
+        index = sp.compute(self.data.token_holders[(token_id, holder)])
+        last_index = sp.compute(sp.as_nat(self.data.holder_count[token_id] - 1))
+        last_holder = sp.compute(self.data.holder_index[(token_id, last_index)])
+        self.data.holder_index[(token_id, index)] = last_holder
+        self.data.token_holders[(token_id, last_holder)] = index
+        del self.data.holder_index[(token_id, last_index)]
+        del self.data.token_holders[(token_id, holder)]
+        self.data.holder_count[token_id] = last_index
+
     def transfer_tx_(self, from_, tx):
         from_pair = (from_, tx.token_id)
         self.data.ledger[from_pair] = sp.as_nat(
@@ -386,7 +409,7 @@ class Fa2Fungible(Common):
             message="FA2_INSUFFICIENT_BALANCE",
         )
         sp.if (self.data.ledger[from_pair] == 0) & (tx.amount > 0):
-            self.data.token_holders[tx.token_id].remove(from_)
+            self.remove_holder_(from_, tx.token_id)
         # Do the transfer
         to_ = (tx.to_, tx.token_id)
         self.data.ledger[to_] = self.data.ledger.get(to_, 0) + tx.amount
@@ -456,6 +479,57 @@ class OffchainviewTokenMetadata:
         sp.result(self.data.token_metadata[token_id])
 
 
+class TemplatedTokenMetadata:
+    """(Mixin) Share the common token_info fields between tokens.
+
+    Tokens created while their template is set only store the fields that
+    differ from it. The `token_metadata` offchain view merges them back so
+    indexers still see the full token_info. Templates are write-once, a
+    change is a new template id that becomes the active template of its
+    kind, so existing tokens keep the fields they were created with.
+
+    Requires the `Admin` mixin.
+    """
+
+    @sp.entry_point
+    def _set_token_template(self, template_id, is_stewardship, token_info):
+        """(Admin only) Add a template and make it the active template of
+        stewardship or event tokens."""
+        sp.verify(self.is_administrator(sp.sender), message="FA2_NOT_ADMIN")
+        sp.set_type(template_id, sp.TNat)
+        sp.set_type(is_stewardship, sp.TBool)
+        sp.set_type(token_info, sp.TMap(sp.TString, sp.TBytes))
+        sp.verify(~self.data.token_templates.contains(template_id), message="FA2_TEMPLATE_EXISTS")
+        self.data.token_templates[template_id] = token_info
+        self.data.active_token_templates[is_stewardship] = template_id
+
+    def compact_token_info(self, token_id, is_stewardship, token_info):
+        """Return the fields of `token_info` that the active template of its
+        kind does not already hold."""
+        result = sp.local("result", token_info)
+        sp.if self.data.active_token_templates.contains(is_stewardship):
+            template_id = sp.compute(self.data.active_token_templates[is_stewardship])
+            template = sp.compute(self.data.token_templates[template_id])
+            result.value = sp.map(tkey=sp.TString, tvalue=sp.TBytes)
+            sp.for item in token_info.items():
+                sp.if template.get_opt(item.key) != sp.some(item.value):
+                    result.value[item.key] = item.value
+            self.data.token_template_ids[token_id] = template_id
+        return result.value
+
+    @sp.offchain_view()
+    def token_metadata(self, token_id):
+        """Returns the token-metadata of the given token, merged with its
+        template."""
+        metadata = sp.local("metadata", self.data.token_metadata[token_id])
+        sp.if self.data.token_template_ids.contains(token_id):
+            token_info = sp.local("token_info", self.data.token_templates[self.data.token_template_ids[token_id]])
+            sp.for item in metadata.value.token_info.items():
+                token_info.value[item.key] = item.value
+            metadata.value.token_info = token_info.value
+        sp.result(metadata.value)
+
+
 class OnchainviewBalanceOf:
     """(Mixin) Non-standard onchain view equivalent to `balance_of`.
 
@@ -476,7 +550,32 @@ class OnchainviewBalanceOf:
 
     @sp.onchain_view()
     def get_token_holders(self, token_id):
-        sp.result(self.data.token_holders[token_id])
+        """Return all the holders of `token_id`, use `get_token_holders_page`
+        for tokens with many holders."""
+        holders = sp.local("holders", sp.set(t=sp.TAddress))
+        sp.for index in sp.range(0, self.data.holder_count[token_id]):
+            holders.value.add(self.data.holder_index[(token_id, index)])
+        sp.result(holders.value)
+
+    @sp.onchain_view()
+    def get_token_holders_page(self, params):
+        """Return at most `limit` holders of `token_id`, starting from the
+        holder at position `offset`.
+
+        Positions are not stable: a burn moves the last holder into the
+        freed position. A walk over several pages that spans a burn can
+        miss that holder, so clients compare `get_holder_count` before and
+        after the walk and restart it when it changed."""
+        sp.set_type(params, sp.TRecord(token_id=sp.TNat, offset=sp.TNat, limit=sp.TNat))
+        end = sp.compute(sp.min(params.offset + params.limit, self.data.holder_count.get(params.token_id, 0)))
+        holders = sp.local("holders", sp.list(t=sp.TAddress))
+        sp.for index in sp.range(params.offset, end):
+            holders.value.push(self.data.holder_index[(params.token_id, index)])
+        sp.result(holders.value.rev())
+
+    @sp.onchain_view()
+    def get_holder_count(self, token_id):
+        sp.result(self.data.holder_count[token_id])
 
 
 class OnchainviewNextTokenID:
@@ -508,23 +607,24 @@ class MintFungible:
                 )
             )
         )
-        # verify sp.sender is one of the multisig
-        sp.verify(sp.view("is_multisig", self.data.factory, sp.sender, sp.TBool).open_some("open is_multisig view error"), "FA2_NOT_ALLOWED_CREATOR")
+        # verify sp.sender is the factory or one of the multisig
+        sp.if sp.sender != self.data.factory:
+            sp.verify(sp.view("is_multisig", self.data.factory, sp.sender, sp.TBool).open_some("open is_multisig view error"), "FA2_NOT_ALLOWED_CREATOR")
         
         with sp.for_("action", batch) as action:
             sp.if action.is_stewardship:
                 self.data.token_metadata[self.data.next_stewardship_token_id] = sp.record(
-                    token_id=self.data.next_stewardship_token_id, token_info=action.token_info
+                    token_id=self.data.next_stewardship_token_id, token_info=self.compact_token_info(self.data.next_stewardship_token_id, True, action.token_info)
                 )
                 self.data.token_minter[self.data.next_stewardship_token_id] = action.minter
-                self.data.token_holders[self.data.next_stewardship_token_id] = sp.set([])
+                self.data.holder_count[self.data.next_stewardship_token_id] = 0
                 self.data.next_stewardship_token_id += 1
             sp.else:
                 self.data.token_metadata[self.data.next_event_token_id] = sp.record(
-                    token_id=self.data.next_event_token_id, token_info=action.token_info
+                    token_id=self.data.next_event_token_id, token_info=self.compact_token_info(self.data.next_event_token_id, False, action.token_info)
                 )
                 self.data.token_minter[self.data.next_event_token_id] = action.minter
-                self.data.token_holders[self.data.next_event_token_id] = sp.set([])
+                self.data.holder_count[self.data.next_event_token_id] = 0
                 self.data.next_event_token_id += 1
     
     # list mint
@@ -547,7 +647,7 @@ class MintFungible:
             sp.verify(sp.sender == self.data.token_minter[action.token_id], "FA2_NOT_MINTER")
             sp.verify(~self.data.ledger.contains((action.address, action.token_id)), "FA2_CANNOT_MINT_TWICE")
             self.data.ledger[(action.address, action.token_id)] = action.amount
-            self.data.token_holders[action.token_id].add(action.address)
+            self.add_holder_(action.address, action.token_id)
 
 
 ############
@@ -555,7 +655,7 @@ class MintFungible:
 ############
 
 
-class FungibleWithMint(Admin, MintFungible, Fa2Fungible, OnchainviewBalanceOf, ChangeMetadata, WithdrawMutez, OnchainviewNextTokenID):
+class FungibleWithMint(Admin, MintFungible, Fa2Fungible, OnchainviewBalanceOf, ChangeMetadata, WithdrawMutez, OnchainviewNextTokenID, TemplatedTokenMetadata):
     def __init__(self, admin, **kwargs):
         Fa2Fungible.__init__(
             self,
@@ -594,4 +694,61 @@ def test():
             }
         }
     )
-    sc += example_fa2_fungible
\ No newline at end of file
+    sc += example_fa2_fungible
+
+    sc.h2("Templated token metadata")
+    template = {
+        "symbol": sp.utils.bytes_of_string("STETK"),
+        "artifactUri": sp.utils.bytes_of_string(MetadataUrl)
+    }
+    example_fa2_fungible._set_token_template(template_id = 0, is_stewardship = True, token_info = sp.map(template)).run(sender = admin)
+    token_info = dict(template, name = sp.utils.bytes_of_string("[STEWARDSHIP TOKEN GEN-1] River"))
+    example_fa2_fungible.create_token([
+        sp.record(is_stewardship = True, minter = admin, token_info = sp.map(token_info)),
+        sp.record(is_stewardship = False, minter = admin, token_info = sp.map(token_info))
+    ]).run(sender = factory)
+    # the stewardship token only keeps its own fields, the event token has no template
+    sc.verify(example_fa2_fungible.data.token_metadata[1].token_info == sp.map({"name": token_info["name"]}))
+    sc.verify(example_fa2_fungible.data.token_template_ids[1] == 0)
+    sc.verify(example_fa2_fungible.data.token_metadata[100001].token_info == sp.map(token_info))
+
+    # templates are write-once, a change is a new template id
+    new_template = dict(template, symbol = sp.utils.bytes_of_string("STETK2"))
+    example_fa2_fungible._set_token_template(template_id = 0, is_stewardship = True, token_info = sp.map(new_template)).run(sender = admin, valid = False, exception = "FA2_TEMPLATE_EXISTS")
+    example_fa2_fungible._set_token_template(template_id = 1, is_stewardship = True, token_info = sp.map(new_template)).run(sender = admin)
+    new_token_info = dict(new_template, name = sp.utils.bytes_of_string("[STEWARDSHIP TOKEN GEN-1] Lake"))
+    example_fa2_fungible.create_token([
+        sp.record(is_stewardship = True, minter = admin, token_info = sp.map(new_token_info))
+    ]).run(sender = factory)
+    sc.verify(example_fa2_fungible.data.token_template_ids[2] == 1)
+    sc.verify(example_fa2_fungible.data.token_metadata[2].token_info == sp.map({"name": new_token_info["name"]}))
+    # the earlier token still merges with the template it was created with
+    sc.verify(example_fa2_fungible.data.token_templates[0] == sp.map(template))
+    sc.verify(example_fa2_fungible.data.token_template_ids[1] == 0)
+    # the offchain view still returns the full token_info of each token for indexers
+    sc.verify(example_fa2_fungible.token_metadata(1) == sp.record(token_id = 1, token_info = sp.map(token_info)))
+    sc.verify(example_fa2_fungible.token_metadata(2) == sp.record(token_id = 2, token_info = sp.map(new_token_info)))
+    sc.verify(example_fa2_fungible.token_metadata(100001) == sp.record(token_id = 100001, token_info = sp.map(token_info)))
+
+    sc.h2("Holder index")
+    alice = sp.test_account("Alice").address
+    bob = sp.test_account("Bob").address
+    carol = sp.test_account("Carol").address
+    example_fa2_fungible.mint([
+        sp.record(address = alice, amount = 1, token_id = 1),
+        sp.record(address = bob, amount = 1, token_id = 1),
+        sp.record(address = carol, amount = 1, token_id = 1)
+    ]).run(sender = admin)
+    sc.verify(example_fa2_fungible.data.holder_count[1] == 3)
+    # burning the first holder moves the last holder into its slot
+    example_fa2_fungible.transfer([
+        sp.record(from_ = alice, txs = [sp.record(to_ = sp.address("tz1burnburnburnburnburnburnburjAYjjX"), token_id = 1, amount = 1)])
+    ]).run(sender = alice)
+    sc.verify(example_fa2_fungible.data.holder_count[1] == 2)
+    sc.verify(~example_fa2_fungible.data.token_holders.contains((1, alice)))
+    sc.verify(example_fa2_fungible.data.holder_index[(1, 0)] == carol)
+    sc.verify(example_fa2_fungible.data.token_holders[(1, carol)] == 0)
+    sc.verify(example_fa2_fungible.get_token_holders(1) == sp.set([bob, carol]))
+    sc.verify(example_fa2_fungible.get_token_holders_page(sp.record(token_id = 1, offset = 0, limit = 1)) == [carol])
+    sc.verify(example_fa2_fungible.get_token_holders_page(sp.record(token_id = 1, offset = 1, limit = 5)) == [bob])
+    sc.verify(example_fa2_fungible.get_token_holders_page(sp.record(token_id = 1, offset = 2, limit = 5)) == [])
\ No newline at end of file
@@ -12,11 +12,23 @@ EVENT_TOKEN_SYMBOL = "EVETK"
 
 MetadataUrl = "ipfs://bafkreifzcdut2wzhwimkqby7qutbyg5zsjqf7qfm5iq7ashpbxwerdyzae"
 
+stewardship_token_params_type = sp.TRecord(multisig_name = sp.TBytes, multisig_description = sp.TBytes, generation = sp.TNat, creator = sp.TAddress)
+
+event_token_params_type = sp.TRecord(event_name = sp.TBytes, event_description = sp.TBytes, multisig_name = sp.TBytes,generation = sp.TNat, creator = sp.TAddress)
+
+def generation_label(generation):
+    # decimal digits of the generation, MultiSigWithFactory.py keeps the same generation_label for on-chain rollover
+    label = sp.local("label", sp.bytes("0x"))
+    number = sp.local("number", generation)
+    sp.while (number.value > 0) | (sp.len(label.value) == 0):
+        label.value = sp.slice(sp.bytes("0x30313233343536373839"), number.value % 10, 1).open_some("open digit Error") + label.value
+        number.value = number.value // 10
+    return label.value
+
 class TokenMetadataGenerator(sp.Contract):
-    def __init__(self, addr_data, orders, stewardship_token, event_token, metadata):
+    def __init__(self, addr_data, stewardship_token, event_token, metadata):
         self.init(
             addresses = addr_data,
-            orders = orders,
             stewardship_token = stewardship_token,
             event_token = event_token,
             metadata = metadata
@@ -48,30 +60,60 @@ class TokenMetadataGenerator(sp.Contract):
     def update_event_token(self, key, value):
         self.is_admin()
         self.data.event_token[key] = value
-        
-    @sp.entry_point
-    def update_orders(self, key, value):
-        self.is_admin()
-        self.data.orders[key] = value
 
-    @sp.onchain_view()
-    def gen_stewardship_token(self, params):
-        sp.set_type(params, sp.TRecord(multisig_name = sp.TBytes, multisig_description = sp.TBytes, generation = sp.TNat, creator = sp.TAddress))
-        result = sp.local("result", self.data.stewardship_token)
-        result.value["name"] = sp.utils.bytes_of_string("[STEWARDSHIP TOKEN GEN-") + self.data.orders[params.generation] + sp.utils.bytes_of_string("] ") +     params.multisig_name
+    def stewardship_token_info(self, template, params):
+        sp.set_type(params, stewardship_token_params_type)
+        result = sp.local("result", template)
+        result.value["name"] = sp.utils.bytes_of_string("[STEWARDSHIP TOKEN GEN-") + generation_label(params.generation) + sp.utils.bytes_of_string("] ") +     params.multisig_name
         result.value["description"] = params.multisig_description
         result.value["creators"] = sp.pack(params.creator)
-        sp.result(result.value)
+        return result.value
 
-    @sp.onchain_view()
-    def gen_event_token(self, params):
-        sp.set_type(params, sp.TRecord(event_name = sp.TBytes, event_description = sp.TBytes, multisig_name = sp.TBytes,generation = sp.TNat, creator = sp.TAddress))
-        result = sp.local("result", self.data.event_token)
-        result.value["name"] = sp.utils.bytes_of_string("[") + params.multisig_name + sp.utils.bytes_of_string(" GEN-") + self.data.orders[params.generation] + sp.utils.bytes_of_string(" EVENT TOKEN] ") + params.event_name
+    def event_token_info(self, template, params):
+        sp.set_type(params, event_token_params_type)
+        result = sp.local("result", template)
+        result.value["name"] = sp.utils.bytes_of_string("[") + params.multisig_name + sp.utils.bytes_of_string(" GEN-") + generation_label(params.generation) + sp.utils.bytes_of_string(" EVENT TOKEN] ") + params.event_name
         
         result.value["description"] = params.event_description
         result.value["creators"] = sp.pack(params.creator)
-        sp.result(result.value)
+        return result.value
+
+    @sp.onchain_view()
+    def gen_stewardship_token(self, params):
+        sp.result(self.stewardship_token_info(self.data.stewardship_token, params))
+
+    @sp.onchain_view()
+    def gen_stewardship_tokens(self, params):
+        sp.set_type(params, sp.TList(stewardship_token_params_type))
+        # load the template once for the whole list
+        template = sp.compute(self.data.stewardship_token)
+        results = sp.local("results", sp.list([]))
+        sp.for token in params:
+            results.value.push(self.stewardship_token_info(template, token))
+        sp.result(results.value.rev())
+
+    @sp.onchain_view()
+    def gen_event_token(self, params):
+        sp.result(self.event_token_info(self.data.event_token, params))
+
+    @sp.onchain_view()
+    def gen_event_tokens(self, params):
+        sp.set_type(params, sp.TList(event_token_params_type))
+        # load the template once for the whole list
+        template = sp.compute(self.data.event_token)
+        results = sp.local("results", sp.list([]))
+        sp.for token in params:
+            results.value.push(self.event_token_info(template, token))
+        sp.result(results.value.rev())
+
+    @sp.onchain_view()
+    def get_token_templates(self):
+        # rivers keep a copy of the templates and fill the token_info themselves, an update of a
+        # template only reaches an existing river after its refresh_token_templates
+        sp.result(sp.record(
+            stewardship = self.data.stewardship_token,
+            event = self.data.event_token
+        ))
         
 
 
@@ -91,16 +133,6 @@ def test():
         l = addrData
     )
 
-    orderData = {}
-    for i in range(1, 101):
-        orderData[i] = sp.utils.bytes_of_string(str(i))
-
-    orders = sp.big_map(
-        tkey = sp.TNat,
-        tvalue = sp.TBytes,
-        l = orderData
-    )
-    
     url = MetadataUrl
     metadata = sp.big_map({"":sp.utils.bytes_of_string(url)})
 
@@ -126,6 +158,43 @@ def test():
         }
     )
 
-    c = TokenMetadataGenerator(addr_data, orders, stewardship_token, event_token, metadata)
+    c = TokenMetadataGenerator(addr_data, stewardship_token, event_token, metadata)
     
-    scenario += c
\ No newline at end of file
+    scenario += c
+
+    scenario.h2("Generation labels")
+    creator = sp.address("KT1F5TgdEDUWH64d8ubFGosi45zbX5uhxrbc")
+    for generation in [0, 1, 9, 10, 100, 101, 12345]:
+        token_info = c.gen_stewardship_token(sp.record(
+            multisig_name = sp.utils.bytes_of_string("River"),
+            multisig_description = sp.utils.bytes_of_string("This is a river."),
+            generation = generation,
+            creator = creator
+        ))
+        scenario.verify(token_info["name"] == sp.utils.bytes_of_string("[STEWARDSHIP TOKEN GEN-" + str(generation) + "] River"))
+
+    scenario.h2("Batched generation")
+    event_params = [
+        sp.record(
+            event_name = sp.utils.bytes_of_string("Event " + str(i)),
+            event_description = sp.utils.bytes_of_string("This is an event."),
+            multisig_name = sp.utils.bytes_of_string("River"),
+            generation = i,
+            creator = creator
+        ) for i in range(3)
+    ]
+    event_tokens = c.gen_event_tokens(sp.list(event_params))
+    scenario.verify(sp.len(event_tokens) == 3)
+    scenario.verify(event_tokens == sp.list([c.gen_event_token(params) for params in event_params]))
+
+    stewardship_params = [
+        sp.record(
+            multisig_name = sp.utils.bytes_of_string("River " + str(i)),
+            multisig_description = sp.utils.bytes_of_string("This is a river."),
+            generation = i,
+            creator = creator
+        ) for i in range(3)
+    ]
+    stewardship_tokens = c.gen_stewardship_tokens(sp.list(stewardship_params))
+    scenario.verify(sp.len(stewardship_tokens) == 3)
+    scenario.verify(stewardship_tokens == sp.list([c.gen_stewardship_token(params) for params in stewardship_params]))
\ No newline at end of file